@@ -3,88 +3,121 @@
 Analyze how the bot handles inventory imbalance
 """
 
-import json
 import os
 from collections import defaultdict
 
-def analyze_imbalance_handling(trades_file):
-    """Analyze how inventory imbalance is handled"""
+import numpy as np
+
+import trades_io
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _scan_numpy(delta, is_up, max_ratio):
+    """Running YES/NO shares, imbalance ratio and limit breaches (NumPy)"""
     
-    with open(trades_file, 'r', encoding='utf-8') as f:
-        trades = json.load(f)
+    yes_shares = np.cumsum(np.where(is_up, delta, 0.0))
+    no_shares = np.cumsum(np.where(is_up, 0.0, delta))
     
-    if not trades:
-        return None
+    # The ratio is only defined (non-NaN) while both sides are held; holding
+    # a single side always counts as exceeding the limit
+    both_held = (yes_shares > 0) & (no_shares > 0)
+    one_sided = (yes_shares > 0) ^ (no_shares > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = np.maximum(yes_shares, no_shares) / np.minimum(yes_shares, no_shares)
+    imbalance_ratios = np.where(both_held, ratios, np.nan)
+    
+    return yes_shares, no_shares, imbalance_ratios, (imbalance_ratios > max_ratio) | one_sided
+
+def _scan_loop(delta, is_up, max_ratio):
+    """Running YES/NO shares, imbalance ratio and limit breaches (Numba kernel)"""
+    
+    n = delta.shape[0]
+    yes_shares = np.empty(n)
+    no_shares = np.empty(n)
+    imbalance_ratios = np.empty(n)
+    exceeds_limit = np.empty(n, dtype=np.bool_)
+    
+    yes = 0.0
+    no = 0.0
+    for i in range(n):
+        if is_up[i]:
+            yes += delta[i]
+        else:
+            no += delta[i]
+        
+        yes_shares[i] = yes
+        no_shares[i] = no
+        if yes > 0 and no > 0:
+            ratio = max(yes, no) / min(yes, no)
+            imbalance_ratios[i] = ratio
+            exceeds_limit[i] = ratio > max_ratio
+        else:
+            imbalance_ratios[i] = np.nan
+            exceeds_limit[i] = yes > 0 or no > 0
     
-    trades_sorted = sorted(trades, key=lambda x: x.get('timestamp', 0))
+    return yes_shares, no_shares, imbalance_ratios, exceeds_limit
+
+if njit is not None:
+    _scan = njit(
+        'Tuple((float64[:], float64[:], float64[:], boolean[:]))(float64[:], boolean[:], float64)',
+        cache=True
+    )(_scan_loop)
+else:
+    _scan = _scan_numpy
+
+def analyze_imbalance_handling(trades_file, detail=False):
+    """Analyze how inventory imbalance is handled
+
+    With detail=True the per-trade position/ratio columns are returned as
+    'imbalance_history' (ratio is NaN unless both sides are held);
+    otherwise only summary stats are kept.
+    """
     
-    # Track position over time
-    yes_shares = 0
-    no_shares = 0
-    yes_cost = 0
-    no_cost = 0
+    trades = trades_io.load(trades_file)
+    
+    if not trades['timestamp'].size:
+        return None
+    
+    outcome_up = trades['outcome_up']
+    side_buy = trades['side_buy']
+    side_sell = trades['side_sell']
+    sizes = trades['size']
     
-    imbalance_history = []
     max_imbalance_ratio = 1.3  # From gabagool config
     
-    for trade in trades_sorted:
-        side = trade.get('outcome', '').lower()
-        trade_side = trade.get('side', '').upper()
-        size = float(trade.get('size', 0))
-        price = float(trade.get('price', 0))
-        cost = size * price
-        
-        if trade_side == 'BUY':
-            if side == 'up':
-                yes_shares += size
-                yes_cost += cost
-            else:
-                no_shares += size
-                no_cost += cost
-        elif trade_side == 'SELL':
-            if side == 'up':
-                yes_shares -= size
-                yes_cost -= cost
-            else:
-                no_shares -= size
-                no_cost -= cost
-        
-        # Calculate imbalance
-        if yes_shares > 0 and no_shares > 0:
-            imbalance_ratio_yes = yes_shares / no_shares
-            imbalance_ratio_no = no_shares / yes_shares
-            max_imbalance = max(imbalance_ratio_yes, imbalance_ratio_no)
-        elif yes_shares > 0:
-            max_imbalance = float('inf')  # Only YES shares
-        elif no_shares > 0:
-            max_imbalance = float('inf')  # Only NO shares
-        else:
-            max_imbalance = 1.0  # Balanced (both zero)
-        
-        imbalance_history.append({
+    # Track position over time: BUY adds shares, SELL removes them
+    delta = np.where(side_buy, sizes, np.where(side_sell, -sizes, 0.0))
+    yes_shares, no_shares, imbalance_ratios, exceeds_limit = _scan(delta, outcome_up, max_imbalance_ratio)
+    
+    imbalance_history = None
+    if detail:
+        imbalance_history = {
             'yes_shares': yes_shares,
             'no_shares': no_shares,
-            'imbalance_ratio': max_imbalance,
-            'exceeds_limit': max_imbalance > max_imbalance_ratio if max_imbalance != float('inf') else True
-        })
+            'imbalance_ratio': imbalance_ratios,
+            'exceeds_limit': exceeds_limit
+        }
     
     # Find max imbalance
-    valid_imbalances = [h['imbalance_ratio'] for h in imbalance_history 
-                       if h['imbalance_ratio'] != float('inf')]
-    max_imbalance_seen = max(valid_imbalances) if valid_imbalances else 1.0
+    max_imbalance_seen = 1.0
+    if not np.isnan(imbalance_ratios).all():
+        max_imbalance_seen = float(np.nanmax(imbalance_ratios))
     
     # Count times imbalance exceeded limit
-    times_exceeded = sum(1 for h in imbalance_history if h['exceeds_limit'])
+    times_exceeded = int(exceeds_limit.sum())
     
     # Final position
-    final_yes = yes_shares
-    final_no = no_shares
+    final_yes = float(yes_shares[-1])
+    final_no = float(no_shares[-1])
     final_imbalance = final_yes / final_no if final_no > 0 else (final_no / final_yes if final_yes > 0 else 1.0)
     
     return {
-        'total_trades': len(trades_sorted),
-        'sell_trades': len([t for t in trades_sorted if t.get('side', '').upper() == 'SELL']),
-        'buy_trades': len([t for t in trades_sorted if t.get('side', '').upper() == 'BUY']),
+        'total_trades': len(sizes),
+        'sell_trades': int(side_sell.sum()),
+        'buy_trades': int(side_buy.sum()),
         'final_yes_shares': final_yes,
         'final_no_shares': final_no,
         'final_imbalance_ratio': final_imbalance,
@@ -115,12 +148,10 @@ def main():
     print("INVENTORY IMBALANCE ANALYSIS")
     print("="*80)
     
-    for market_file in markets:
-        if not os.path.exists(market_file):
-            continue
-        
+    results = {m: analyze_imbalance_handling(m, detail=False) for m in trades_io.existing_files(markets)}
+    
+    for market_file, result in results.items():
         market_name = os.path.basename(market_file).replace('_trades.json', '')
-        result = analyze_imbalance_handling(market_file)
         
         if not result:
             continue
@@ -157,8 +188,8 @@ def main():
     
     # Check if _can_buy logic is working
     all_within_limit = all(
-        analyze_imbalance_handling(m)['final_imbalance_ratio'] <= 1.3 
-        for m in markets if os.path.exists(m)
+        r['final_imbalance_ratio'] <= 1.3
+        for r in results.values() if r
     )
     
     if all_within_limit:
@@ -3,28 +3,33 @@
 Analyze order placement strategy from trades.json
 """
 
-import json
 import sys
 from datetime import datetime
-from collections import defaultdict
+
+import numpy as np
+
+import trades_io
 
 def analyze_order_strategy(trades_file):
     """Analyze how orders are placed based on trade data"""
     
-    with open(trades_file, 'r', encoding='utf-8') as f:
-        trades = json.load(f)
+    # Columns come back sorted by timestamp
+    trades = trades_io.load(trades_file)
     
-    if not trades:
+    if not trades['timestamp'].size:
         print("No trades found")
         return
     
-    # Sort by timestamp
-    trades_sorted = sorted(trades, key=lambda x: x.get('timestamp', 0))
+    prices = trades['price'].tolist()
+    sizes = trades['size'].tolist()
+    tx_hashes = trades['tx_hash'].tolist()
+    outcomes = np.where(trades['outcome_up'], 'UP',
+                        np.where(trades['outcome_down'], 'DOWN', np.char.upper(trades['outcome_other']))).tolist()
     
     print("="*80)
     print("ORDER PLACEMENT STRATEGY ANALYSIS")
     print("="*80)
-    print(f"\nTotal Trades: {len(trades_sorted)}")
+    print(f"\nTotal Trades: {len(trades['timestamp'])}")
     
     # Analyze first 20 trades to see pattern
     print("\n" + "="*80)
@@ -36,12 +41,13 @@ def analyze_order_strategy(trades_file):
     yes_cost = 0
     no_cost = 0
     
-    for i, trade in enumerate(trades_sorted[:20]):
-        side = trade.get('outcome', '').upper()
-        price = float(trade.get('price', 0))
-        size = float(trade.get('size', 0))
+    first_ts = trades['timestamp'][:20].tolist()
+    
+    for i, timestamp in enumerate(first_ts):
+        side = outcomes[i]
+        price = prices[i]
+        size = sizes[i]
         cost = price * size
-        timestamp = trade.get('timestamp', 0)
         
         if timestamp:
             dt = datetime.fromtimestamp(timestamp)
@@ -75,26 +81,27 @@ def analyze_order_strategy(trades_file):
     print("="*80)
     
     # Group trades by transaction hash (same transaction = paired orders)
-    by_tx = defaultdict(list)
-    for trade in trades_sorted:
-        tx_hash = trade.get('transactionHash', '')
-        if tx_hash:
-            by_tx[tx_hash].append(trade)
+    with_tx = np.flatnonzero(trades['tx_hash'] != '')
+    _, tx_first, tx_group, tx_counts = np.unique(trades['tx_hash'][with_tx], return_index=True,
+                                                 return_inverse=True, return_counts=True)
     
-    paired_trades = [trades for trades in by_tx.values() if len(trades) >= 2]
-    single_trades = [trades for trades in by_tx.values() if len(trades) == 1]
+    # Keep groups in order of first appearance
+    paired_groups = np.flatnonzero(tx_counts >= 2)
+    paired_groups = paired_groups[np.argsort(tx_first[paired_groups])]
+    single_count = int((tx_counts == 1).sum())
     
-    print(f"\nPaired Orders (same transaction): {len(paired_trades)}")
-    print(f"Single Orders: {len(single_trades)}")
+    print(f"\nPaired Orders (same transaction): {len(paired_groups)}")
+    print(f"Single Orders: {single_count}")
     
-    if paired_trades:
+    if paired_groups.size:
         print(f"\nExample Paired Orders (first 5):")
-        for i, pair in enumerate(paired_trades[:5]):
-            print(f"\n  Transaction {i+1}: {pair[0].get('transactionHash', '')[:20]}...")
-            for trade in pair:
-                side = trade.get('outcome', '').upper()
-                price = float(trade.get('price', 0))
-                size = float(trade.get('size', 0))
+        for i, group in enumerate(paired_groups[:5]):
+            pair = with_tx[tx_group == group].tolist()
+            print(f"\n  Transaction {i+1}: {tx_hashes[pair[0]][:20]}...")
+            for j in pair:
+                side = outcomes[j]
+                price = prices[j]
+                size = sizes[j]
                 print(f"    {side:4} @ ${price:.4f} x {size:.2f} = ${price * size:.2f}")
     
     # Analyze timing between YES and NO orders
@@ -103,27 +110,27 @@ def analyze_order_strategy(trades_file):
     print("="*80)
     
     # Look for sequential YES/NO pairs
-    yes_trades = [t for t in trades_sorted if t.get('outcome', '').upper() == 'UP']
-    no_trades = [t for t in trades_sorted if t.get('outcome', '').upper() == 'DOWN']
+    yes_mask = trades['outcome_up']
+    no_mask = trades['outcome_down']
+    yes_count = int(yes_mask.sum())
+    no_count = int(no_mask.sum())
     
-    print(f"\nYES Trades: {len(yes_trades)}")
-    print(f"NO Trades: {len(no_trades)}")
-    print(f"Ratio: {len(yes_trades)/len(no_trades):.2f}:1" if no_trades else "N/A")
+    print(f"\nYES Trades: {yes_count}")
+    print(f"NO Trades: {no_count}")
+    print(f"Ratio: {yes_count/no_count:.2f}:1" if no_count else "N/A")
     
     # Check if orders are placed simultaneously or sequentially
-    time_diffs = []
-    for i in range(min(len(yes_trades), len(no_trades))):
-        yes_ts = yes_trades[i].get('timestamp', 0)
-        no_ts = no_trades[i].get('timestamp', 0)
-        if yes_ts and no_ts:
-            diff = abs(yes_ts - no_ts)
-            time_diffs.append(diff)
-    
-    if time_diffs:
-        avg_diff = sum(time_diffs) / len(time_diffs)
+    yes_ts = trades['timestamp'][yes_mask]
+    no_ts = trades['timestamp'][no_mask]
+    n = min(len(yes_ts), len(no_ts))
+    yes_ts, no_ts = yes_ts[:n], no_ts[:n]
+    time_diffs = np.abs(yes_ts - no_ts)[(yes_ts != 0) & (no_ts != 0)]
+    
+    if time_diffs.size:
+        avg_diff = time_diffs.mean()
         print(f"\nAverage time difference between YES/NO orders: {avg_diff:.2f} seconds")
-        print(f"Min difference: {min(time_diffs):.2f} seconds")
-        print(f"Max difference: {max(time_diffs):.2f} seconds")
+        print(f"Min difference: {time_diffs.min():.2f} seconds")
+        print(f"Max difference: {time_diffs.max():.2f} seconds")
         if avg_diff < 1.0:
             print("  -> Orders are placed SIMULTANEOUSLY (within same second)")
         elif avg_diff < 5.0:
@@ -136,47 +143,50 @@ def analyze_order_strategy(trades_file):
     print("PRICE PATTERN ANALYSIS")
     print("="*80)
     
-    yes_prices = [float(t.get('price', 0)) for t in yes_trades]
-    no_prices = [float(t.get('price', 0)) for t in no_trades]
+    yes_prices = trades['price'][yes_mask]
+    no_prices = trades['price'][no_mask]
     
-    if yes_prices and no_prices:
-        print(f"\nYES Price Range: ${min(yes_prices):.4f} - ${max(yes_prices):.4f}")
-        print(f"NO Price Range: ${min(no_prices):.4f} - ${max(no_prices):.4f}")
+    if yes_prices.size and no_prices.size:
+        print(f"\nYES Price Range: ${yes_prices.min():.4f} - ${yes_prices.max():.4f}")
+        print(f"NO Price Range: ${no_prices.min():.4f} - ${no_prices.max():.4f}")
         
-        # Calculate combined prices
-        combined_prices = []
-        for i in range(min(len(yes_prices), len(no_prices))):
-            combined = yes_prices[i] + no_prices[i]
-            combined_prices.append(combined)
+        # Calculate combined prices (i-th YES trade paired with i-th NO trade)
+        n = min(len(yes_prices), len(no_prices))
+        combined_prices = yes_prices[:n] + no_prices[:n]
         
-        if combined_prices:
-            print(f"\nCombined Price Range: ${min(combined_prices):.4f} - ${max(combined_prices):.4f}")
-            print(f"Average Combined: ${sum(combined_prices)/len(combined_prices):.4f}")
-            print(f"Min Combined (best arb): ${min(combined_prices):.4f} (${(1.0 - min(combined_prices)):.4f} profit)")
-            print(f"Max Combined: ${max(combined_prices):.4f}")
+        if n:
+            combined_min = combined_prices.min()
+            combined_max = combined_prices.max()
+            print(f"\nCombined Price Range: ${combined_min:.4f} - ${combined_max:.4f}")
+            print(f"Average Combined: ${combined_prices.mean():.4f}")
+            print(f"Min Combined (best arb): ${combined_min:.4f} (${(1.0 - combined_min):.4f} profit)")
+            print(f"Max Combined: ${combined_max:.4f}")
             
             # Count arbitrage opportunities
-            arb_count = sum(1 for c in combined_prices if c < 0.97)
-            print(f"\nArbitrage Opportunities (combined < 0.97): {arb_count}/{len(combined_prices)} ({arb_count/len(combined_prices)*100:.1f}%)")
+            arb_count = int((combined_prices < 0.97).sum())
+            print(f"\nArbitrage Opportunities (combined < 0.97): {arb_count}/{n} ({arb_count/n*100:.1f}%)")
     
     # Analyze order sizes
     print("\n" + "="*80)
     print("ORDER SIZE ANALYSIS")
     print("="*80)
     
-    all_sizes = [float(t.get('size', 0)) for t in trades_sorted]
-    all_costs = [float(t.get('price', 0)) * float(t.get('size', 0)) for t in trades_sorted]
+    all_sizes = trades['size']
+    all_costs = trades['price'] * trades['size']
+    
+    # Upper median (element n//2 of the sorted sizes) without a full sort
+    mid = len(all_sizes) // 2
     
     print(f"\nShare Sizes:")
-    print(f"  Min: {min(all_sizes):.2f} shares")
-    print(f"  Max: {max(all_sizes):.2f} shares")
-    print(f"  Avg: {sum(all_sizes)/len(all_sizes):.2f} shares")
-    print(f"  Median: {sorted(all_sizes)[len(all_sizes)//2]:.2f} shares")
+    print(f"  Min: {all_sizes.min():.2f} shares")
+    print(f"  Max: {all_sizes.max():.2f} shares")
+    print(f"  Avg: {all_sizes.mean():.2f} shares")
+    print(f"  Median: {np.partition(all_sizes, mid)[mid]:.2f} shares")
     
     print(f"\nOrder Costs:")
-    print(f"  Min: ${min(all_costs):.2f}")
-    print(f"  Max: ${max(all_costs):.2f}")
-    print(f"  Avg: ${sum(all_costs)/len(all_costs):.2f}")
+    print(f"  Min: ${all_costs.min():.2f}")
+    print(f"  Max: ${all_costs.max():.2f}")
+    print(f"  Avg: ${all_costs.mean():.2f}")
     
     # Strategy summary
     print("\n" + "="*80)
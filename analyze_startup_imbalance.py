@@ -3,75 +3,64 @@
 Analyze imbalance at market start and initial trading pattern
 """
 
-import json
 import os
-import datetime
-import matplotlib.pyplot as plt
+from collections import Counter
 import numpy as np
 
+import trades_io
+
 def analyze_startup_pattern(trades_file, market_start_time):
     """Analyze trading pattern in first few minutes"""
     
-    with open(trades_file, 'r', encoding='utf-8') as f:
-        trades = json.load(f)
+    # Columns come back sorted by timestamp
+    trades = trades_io.load(trades_file)
     
-    if not trades:
+    if not trades['timestamp'].size:
         return None
     
-    trades_sorted = sorted(trades, key=lambda x: x.get('timestamp', 0))
+    # Trades without a timestamp are skipped entirely
+    has_timestamp = trades['timestamp'] != 0
+    if not has_timestamp.any():
+        return None
     
-    # Track position over time
-    yes_shares = 0
-    no_shares = 0
+    timestamps = trades['timestamp'][has_timestamp]
+    outcome_up = trades['outcome_up'][has_timestamp]
+    side_buy = trades['side_buy'][has_timestamp]
+    sizes = trades['size'][has_timestamp]
     
-    startup_data = []
-    max_imbalance_ratio = 1.3
+    # Track position over time (only BUY trades add shares)
+    yes_shares = np.cumsum(np.where(side_buy & outcome_up, sizes, 0.0))
+    no_shares = np.cumsum(np.where(side_buy & ~outcome_up, sizes, 0.0))
     
-    for trade in trades_sorted:
-        side = trade.get('outcome', '').lower()
-        trade_side = trade.get('side', '').upper()
-        size = float(trade.get('size', 0))
-        timestamp = trade.get('timestamp', 0)
-        
-        if not timestamp:
-            continue
-        
-        if trade_side == 'BUY':
-            if side == 'up':
-                yes_shares += size
-            else:
-                no_shares += size
-        
-        # Calculate time from market start
-        seconds_from_start = timestamp - market_start_time
-        minutes_from_start = seconds_from_start / 60.0
-        
-        # Calculate imbalance
-        if yes_shares > 0 and no_shares > 0:
-            imbalance_ratio = max(yes_shares / no_shares, no_shares / yes_shares)
-        elif yes_shares > 0:
-            imbalance_ratio = float('inf')
-        elif no_shares > 0:
-            imbalance_ratio = float('inf')
-        else:
-            imbalance_ratio = 1.0
-        
-        startup_data.append({
-            'minutes_from_start': minutes_from_start,
-            'yes_shares': yes_shares,
-            'no_shares': no_shares,
-            'imbalance_ratio': imbalance_ratio if imbalance_ratio != float('inf') else 100,
-            'side': side,
-            'trade_side': trade_side,
-            'size': size,
-            'timestamp': timestamp
-        })
+    # Calculate imbalance; undefined (NaN) while only one side is held
+    both_held = (yes_shares > 0) & (no_shares > 0)
+    one_sided = ~both_held & ((yes_shares > 0) | (no_shares > 0))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = np.maximum(yes_shares, no_shares) / np.minimum(yes_shares, no_shares)
+    imbalance_ratios = np.where(both_held, ratios, np.where(one_sided, np.nan, 1.0))
     
-    return startup_data
+    return {
+        'minutes_from_start': (timestamps - market_start_time) / 60.0,
+        'yes_shares': yes_shares,
+        'no_shares': no_shares,
+        'imbalance_ratio': imbalance_ratios,
+        'side': np.where(outcome_up, 'up', np.where(trades['outcome_down'][has_timestamp], 'down',
+                                                   np.char.lower(trades['outcome_other'][has_timestamp]))),
+        'trade_side': np.where(side_buy, 'BUY', np.where(trades['side_sell'][has_timestamp], 'SELL',
+                                                         np.char.upper(trades['side_other'][has_timestamp]))),
+        'size': sizes,
+        'timestamp': timestamps
+    }
 
 def create_startup_analysis():
     """Create detailed startup analysis"""
     import sys
+    import datetime
+    
+    # Plotting is CLI-only; keep matplotlib out of analyze_startup_pattern imports
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
     
     if len(sys.argv) > 1:
         # Accept trades file and report name as arguments
@@ -128,11 +117,11 @@ def create_startup_analysis():
             }
         ]
     
-    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-    fig.suptitle('Market Startup Imbalance Analysis', fontsize=16, fontweight='bold')
-    
-    for market_idx, market in enumerate(markets):
-        if not os.path.exists(market['file']):
+    # Parse each market once; the plot and both reports reuse the columns
+    parsed = {}
+    existing = set(trades_io.existing_files([m['file'] for m in markets]))
+    for market in markets:
+        if market['file'] not in existing:
             continue
         
         # Parse start time
@@ -142,16 +131,27 @@ def create_startup_analysis():
         
         startup_data = analyze_startup_pattern(market['file'], start_ts)
         
-        if not startup_data:
-            continue
+        if startup_data:
+            parsed[market['name']] = startup_data
+    
+    markets = [m for m in markets if m['name'] in parsed]
+    
+    # One row of plots per market
+    rows = max(len(markets), 1)
+    fig, axes = plt.subplots(rows, 2, figsize=(16, 6 * rows), squeeze=False, constrained_layout=True)
+    fig.suptitle('Market Startup Imbalance Analysis', fontsize=16, fontweight='bold')
+    
+    for market_idx, market in enumerate(markets):
+        startup_data = parsed[market['name']]
         
-        # Focus on first 5 minutes
-        first_5_min = [d for d in startup_data if d['minutes_from_start'] <= 5.0]
+        # Focus on first 5 minutes (minutes are sorted, so this is a prefix)
+        first_5_min = np.searchsorted(startup_data['minutes_from_start'], 5.0, side='right')
         
-        minutes = [d['minutes_from_start'] for d in first_5_min]
-        yes_shares = [d['yes_shares'] for d in first_5_min]
-        no_shares = [d['no_shares'] for d in first_5_min]
-        imbalance_ratios = [d['imbalance_ratio'] for d in first_5_min]
+        minutes = startup_data['minutes_from_start'][:first_5_min]
+        yes_shares = startup_data['yes_shares'][:first_5_min]
+        no_shares = startup_data['no_shares'][:first_5_min]
+        # One-sided positions are drawn capped at 100
+        imbalance_ratios = np.nan_to_num(startup_data['imbalance_ratio'][:first_5_min], nan=100.0)
         
         # 1. Shares over time (first 5 minutes)
         ax1 = axes[market_idx, 0]
@@ -171,17 +171,16 @@ def create_startup_analysis():
         ax2.axhline(y=1.3, color='red', linestyle='--', linewidth=2, label='Max Limit (1.3)', alpha=0.7)
         ax2.axhline(y=1.0, color='green', linestyle='--', linewidth=1, label='Perfect Balance', alpha=0.5)
         ax2.fill_between(minutes, 1.0, imbalance_ratios, 
-                         where=[r > 1.0 for r in imbalance_ratios],
+                         where=imbalance_ratios > 1.0,
                          alpha=0.2, color='red')
         ax2.set_xlabel('Minutes from Market Start', fontsize=10)
         ax2.set_ylabel('Imbalance Ratio', fontsize=10)
         ax2.set_title(f'{market["display"]} - Imbalance Ratio (First 5 Min)', fontsize=11, fontweight='bold')
         ax2.legend()
         ax2.grid(True, alpha=0.3)
-        ax2.set_ylim(0, min(max(imbalance_ratios) * 1.1, 15) if imbalance_ratios else 5)
+        ax2.set_ylim(0, min(imbalance_ratios.max() * 1.1, 15) if imbalance_ratios.size else 5)
     
-    plt.tight_layout()
-    plt.savefig('reports/startup_imbalance_analysis.png', dpi=200, bbox_inches='tight')
+    plt.savefig('reports/startup_imbalance_analysis.png', dpi=120)
     print("Startup imbalance analysis saved as 'reports/startup_imbalance_analysis.png'")
     plt.close()
     
@@ -191,71 +190,63 @@ def create_startup_analysis():
     print("="*80)
     
     for market in markets:
-        if not os.path.exists(market['file']):
-            continue
-        
-        start_parts = market['start'].split(':')
-        start_dt = datetime.datetime(2025, 12, 12, int(start_parts[0]), int(start_parts[1]), int(start_parts[2]))
-        start_ts = start_dt.timestamp()
+        startup_data = parsed[market['name']]
         
-        startup_data = analyze_startup_pattern(market['file'], start_ts)
-        
-        if not startup_data:
-            continue
+        minutes = startup_data['minutes_from_start']
+        yes_shares = startup_data['yes_shares']
+        no_shares = startup_data['no_shares']
+        imbalance_ratios = startup_data['imbalance_ratio']
+        sides = startup_data['side']
         
-        # Analyze first minute
-        first_minute = [d for d in startup_data if d['minutes_from_start'] <= 1.0]
-        first_30_sec = [d for d in startup_data if d['minutes_from_start'] <= 0.5]
+        # Analyze first minute; minutes are sorted, so each window is a prefix
+        first_30_sec, first_minute = np.searchsorted(minutes, [0.5, 1.0], side='right')
         
         print(f"\n{market['display']} Market:")
         print("-" * 60)
         
         # First trade analysis
-        if startup_data:
-            first_trade = startup_data[0]
-            print(f"First Trade:")
-            print(f"  Time: {first_trade['minutes_from_start']:.3f} min from start ({first_trade['minutes_from_start']*60:.1f} seconds)")
-            print(f"  Side: {first_trade['side'].upper()}")
-            print(f"  Size: {first_trade['size']:.2f} shares")
+        print(f"First Trade:")
+        print(f"  Time: {minutes[0]:.3f} min from start ({minutes[0]*60:.1f} seconds)")
+        print(f"  Side: {sides[0].upper()}")
+        print(f"  Size: {startup_data['size'][0]:.2f} shares")
         
         # First 30 seconds
         if first_30_sec:
-            yes_trades_30s = [d for d in first_30_sec if d['side'] == 'up']
-            no_trades_30s = [d for d in first_30_sec if d['side'] == 'down']
+            side_counts_30s = Counter(sides[:first_30_sec].tolist())
             
             print(f"\nFirst 30 Seconds:")
-            print(f"  YES trades: {len(yes_trades_30s)}")
-            print(f"  NO trades: {len(no_trades_30s)}")
+            print(f"  YES trades: {side_counts_30s['up']}")
+            print(f"  NO trades: {side_counts_30s['down']}")
             
-            if first_30_sec:
-                final_30s = first_30_sec[-1]
-                print(f"  YES shares: {final_30s['yes_shares']:.2f}")
-                print(f"  NO shares: {final_30s['no_shares']:.2f}")
-                if final_30s['yes_shares'] > 0 and final_30s['no_shares'] > 0:
-                    ratio = max(final_30s['yes_shares'] / final_30s['no_shares'],
-                              final_30s['no_shares'] / final_30s['yes_shares'])
-                    print(f"  Imbalance ratio: {ratio:.2f}")
-                elif final_30s['yes_shares'] > 0:
-                    print(f"  Imbalance: Only YES shares (infinite ratio)")
-                elif final_30s['no_shares'] > 0:
-                    print(f"  Imbalance: Only NO shares (infinite ratio)")
+            final_30s = first_30_sec - 1
+            yes_30s = yes_shares[final_30s]
+            no_30s = no_shares[final_30s]
+            print(f"  YES shares: {yes_30s:.2f}")
+            print(f"  NO shares: {no_30s:.2f}")
+            if yes_30s > 0 and no_30s > 0:
+                ratio = max(yes_30s / no_30s, no_30s / yes_30s)
+                print(f"  Imbalance ratio: {ratio:.2f}")
+            elif yes_30s > 0:
+                print(f"  Imbalance: Only YES shares (infinite ratio)")
+            elif no_30s > 0:
+                print(f"  Imbalance: Only NO shares (infinite ratio)")
         
         # First minute
         if first_minute:
-            yes_trades_1m = [d for d in first_minute if d['side'] == 'up']
-            no_trades_1m = [d for d in first_minute if d['side'] == 'down']
+            side_counts_1m = Counter(sides[:first_minute].tolist())
             
             print(f"\nFirst Minute:")
-            print(f"  Total trades: {len(first_minute)}")
-            print(f"  YES trades: {len(yes_trades_1m)}")
-            print(f"  NO trades: {len(no_trades_1m)}")
+            print(f"  Total trades: {first_minute}")
+            print(f"  YES trades: {side_counts_1m['up']}")
+            print(f"  NO trades: {side_counts_1m['down']}")
             
-            final_1m = first_minute[-1]
-            print(f"  Final YES shares: {final_1m['yes_shares']:.2f}")
-            print(f"  Final NO shares: {final_1m['no_shares']:.2f}")
-            if final_1m['yes_shares'] > 0 and final_1m['no_shares'] > 0:
-                ratio = max(final_1m['yes_shares'] / final_1m['no_shares'],
-                          final_1m['no_shares'] / final_1m['yes_shares'])
+            final_1m = first_minute - 1
+            yes_1m = yes_shares[final_1m]
+            no_1m = no_shares[final_1m]
+            print(f"  Final YES shares: {yes_1m:.2f}")
+            print(f"  Final NO shares: {no_1m:.2f}")
+            if yes_1m > 0 and no_1m > 0:
+                ratio = max(yes_1m / no_1m, no_1m / yes_1m)
                 print(f"  Imbalance ratio: {ratio:.2f}")
                 if ratio > 1.3:
                     print(f"  [EXCEEDS LIMIT] Ratio {ratio:.2f} > 1.3")
@@ -263,49 +254,37 @@ def create_startup_analysis():
                     print(f"  [WITHIN LIMIT] Ratio {ratio:.2f} <= 1.3")
         
         # Find when balance is achieved
-        balanced_trades = [d for d in startup_data 
-                          if d['yes_shares'] > 0 and d['no_shares'] > 0 
-                          and max(d['yes_shares']/d['no_shares'], d['no_shares']/d['yes_shares']) <= 1.3]
+        balanced_mask = (yes_shares > 0) & (no_shares > 0) & (imbalance_ratios <= 1.3)
         
-        if balanced_trades:
-            first_balanced = balanced_trades[0]
+        if balanced_mask.any():
+            first_balanced = int(np.argmax(balanced_mask))
             print(f"\nBalance Achieved:")
-            print(f"  Time: {first_balanced['minutes_from_start']:.3f} min from start")
-            print(f"  Trade #: {startup_data.index(first_balanced) + 1}")
-            print(f"  YES shares: {first_balanced['yes_shares']:.2f}")
-            print(f"  NO shares: {first_balanced['no_shares']:.2f}")
+            print(f"  Time: {minutes[first_balanced]:.3f} min from start")
+            print(f"  Trade #: {first_balanced + 1}")
+            print(f"  YES shares: {yes_shares[first_balanced]:.2f}")
+            print(f"  NO shares: {no_shares[first_balanced]:.2f}")
         
         # Find max imbalance
-        valid_imbalances = [d for d in startup_data 
-                           if d['imbalance_ratio'] != 100 and d['imbalance_ratio'] != float('inf')]
-        if valid_imbalances:
-            max_imbalance = max(valid_imbalances, key=lambda x: x['imbalance_ratio'])
+        if not np.isnan(imbalance_ratios).all():
+            max_imbalance = int(np.nanargmax(imbalance_ratios))
             print(f"\nMax Imbalance:")
-            print(f"  Time: {max_imbalance['minutes_from_start']:.3f} min from start")
-            print(f"  Ratio: {max_imbalance['imbalance_ratio']:.2f}")
-            print(f"  YES shares: {max_imbalance['yes_shares']:.2f}")
-            print(f"  NO shares: {max_imbalance['no_shares']:.2f}")
+            print(f"  Time: {minutes[max_imbalance]:.3f} min from start")
+            print(f"  Ratio: {imbalance_ratios[max_imbalance]:.2f}")
+            print(f"  YES shares: {yes_shares[max_imbalance]:.2f}")
+            print(f"  NO shares: {no_shares[max_imbalance]:.2f}")
     
     print("\n" + "="*80)
     print("KEY INSIGHTS:")
     print("="*80)
     
     # Check if bot buys one side first
-    all_first_trades = []
-    for market in markets:
-        if not os.path.exists(market['file']):
-            continue
-        start_parts = market['start'].split(':')
-        start_dt = datetime.datetime(2025, 12, 12, int(start_parts[0]), int(start_parts[1]), int(start_parts[2]))
-        start_ts = start_dt.timestamp()
-        startup_data = analyze_startup_pattern(market['file'], start_ts)
-        if startup_data:
-            all_first_trades.append(startup_data[0]['side'])
+    all_first_trades = [str(parsed[market['name']]['side'][0]) for market in markets]
     
     if all_first_trades:
         print(f"\nFirst Trade Pattern:")
-        yes_first = sum(1 for s in all_first_trades if s == 'up')
-        no_first = sum(1 for s in all_first_trades if s == 'down')
+        first_side_counts = Counter(all_first_trades)
+        yes_first = first_side_counts['up']
+        no_first = first_side_counts['down']
         print(f"  YES first: {yes_first} markets")
         print(f"  NO first: {no_first} markets")
         
@@ -3,256 +3,336 @@
 Comprehensive trade analysis script for Polymarket trades
 """
 
-import json
 import datetime
-from collections import defaultdict
-from statistics import mean, median, stdev
+from collections import Counter, defaultdict
 import sys
 
-def load_trades(filename="trades.json"):
-    """Load trades from JSON file"""
-    with open(filename, 'r', encoding='utf-8') as f:
-        return json.load(f)
+import numpy as np
 
-def analyze_trades(trades):
-    """Perform comprehensive analysis on trades"""
+import trades_io
+
+# Report sections analyze_trades can produce; 'arb' is the combined price
+# part of the price movement analysis
+SECTIONS = frozenset({'basic', 'breakdown', 'prices', 'volume', 'minute', 'movement', 'arb', 'txn'})
+
+def analyze_trades(trades, *, sections=SECTIONS):
+    """Perform comprehensive analysis on trades
+
+    ``trades`` may be any iterable (e.g. trades_io.iter_trades()); it is consumed in
+    a single pass and only compact per-trade columns are kept. ``sections``
+    selects which parts of the report (see SECTIONS) are computed and printed.
+    """
+    
+    sections = frozenset(sections)
+    unknown = sections - SECTIONS
+    if unknown:
+        raise ValueError(f"Unknown report sections: {', '.join(sorted(unknown))}")
+    want_basic = 'basic' in sections
+    want_breakdown = 'breakdown' in sections
+    want_prices = 'prices' in sections
+    want_volume = 'volume' in sections
+    want_minute = 'minute' in sections
+    want_movement = 'movement' in sections or 'arb' in sections
+    want_txn = 'txn' in sections
+    
+    # Categorize every trade in a single pass: per (side, outcome) running
+    # [count, shares, cost] plus the columns used by the later sections,
+    # each kept only when its section is wanted
+    total_trades = 0
+    category_totals = {(side, outcome): [0, 0.0, 0.0]
+                       for side in ('BUY', 'SELL') for outcome in ('up', 'down')}
+    side_counts = {'BUY': 0, 'SELL': 0}
+    timestamps_seen = set()
+    prices = []
+    sizes = []
+    costs = []
+    up_prices = []
+    down_prices = []
+    timestamps = []
+    outcomes = []
+    tx_hashes = []
+    trades_by_minute = defaultdict(lambda: [0, 0.0, 0.0])
+    title = None
     
-    if not trades:
+    for t in trades:
+        if title is None:
+            title = t.get('title', 'Unknown')
+        
+        side = t.get('side', '').upper()
+        outcome = t.get('outcome', '').lower()
+        price = float(t.get('price', 0))
+        size = float(t.get('size', 0))
+        cost = price * size
+        ts = t.get('timestamp', 0)
+        total_trades += 1
+        
+        # Timestamps order the trades for the time range and price movement
+        if want_basic:
+            timestamps_seen.add(ts)
+        if want_basic or want_movement:
+            timestamps.append(ts)
+        if want_movement:
+            outcomes.append(outcome)
+        if want_txn:
+            tx_hashes.append(t.get('transactionHash', ''))
+        if want_prices or want_movement:
+            prices.append(price)
+        if want_volume:
+            sizes.append(size)
+            costs.append(cost)
+        
+        if want_prices:
+            if outcome == 'up':
+                up_prices.append(price)
+            elif outcome == 'down':
+                down_prices.append(price)
+        
+        if want_breakdown:
+            if side in side_counts:
+                side_counts[side] += 1
+            
+            totals = category_totals.get((side, outcome))
+            if totals is not None:
+                totals[0] += 1
+                totals[1] += size
+                totals[2] += cost
+        
+        # Running [count, shares, cost] per epoch minute; only the printed
+        # minutes are formatted as HH:MM
+        if want_minute and ts:
+            bucket = trades_by_minute[int(ts) // 60]
+            bucket[0] += 1
+            bucket[1] += size
+            bucket[2] += cost
+    
+    if not total_trades:
         print("No trades to analyze.")
         return
     
-    # Sort by timestamp
-    trades_sorted = sorted(trades, key=lambda x: x.get('timestamp', 0))
-    
-    # Basic statistics
-    total_trades = len(trades)
-    unique_timestamps = len(set(t.get('timestamp', 0) for t in trades))
-    
-    # Separate by side and outcome
-    buy_trades = [t for t in trades if t.get('side', '').upper() == 'BUY']
-    sell_trades = [t for t in trades if t.get('side', '').upper() == 'SELL']
+    # Trade indices sorted by timestamp (stable, like sorting the dicts)
+    order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
     
-    up_trades = [t for t in trades if t.get('outcome', '').lower() == 'up']
-    down_trades = [t for t in trades if t.get('outcome', '').lower() == 'down']
+    unique_timestamps = len(timestamps_seen)
     
-    # Price analysis
-    prices = [float(t.get('price', 0)) for t in trades]
-    sizes = [float(t.get('size', 0)) for t in trades]
-    costs = [p * s for p, s in zip(prices, sizes)]
+    prices = np.asarray(prices, dtype=np.float64)
+    sizes = np.asarray(sizes, dtype=np.float64)
+    costs = np.asarray(costs, dtype=np.float64)
+    up_prices = np.asarray(up_prices, dtype=np.float64)
+    down_prices = np.asarray(down_prices, dtype=np.float64)
     
     # Time analysis
-    timestamps = [t.get('timestamp', 0) for t in trades_sorted]
-    if timestamps:
-        start_time = datetime.datetime.fromtimestamp(timestamps[0])
-        end_time = datetime.datetime.fromtimestamp(timestamps[-1])
+    if order:
+        start_time = datetime.datetime.fromtimestamp(timestamps[order[0]])
+        end_time = datetime.datetime.fromtimestamp(timestamps[order[-1]])
         duration = end_time - start_time
     else:
         start_time = end_time = duration = None
     
-    # Group by outcome and side
-    buy_up = [t for t in trades if t.get('side', '').upper() == 'BUY' and t.get('outcome', '').lower() == 'up']
-    buy_down = [t for t in trades if t.get('side', '').upper() == 'BUY' and t.get('outcome', '').lower() == 'down']
-    sell_up = [t for t in trades if t.get('side', '').upper() == 'SELL' and t.get('outcome', '').lower() == 'up']
-    sell_down = [t for t in trades if t.get('side', '').upper() == 'SELL' and t.get('outcome', '').lower() == 'down']
-    
     # Calculate totals by category
-    def calc_totals(trade_list):
-        total_shares = sum(float(t.get('size', 0)) for t in trade_list)
-        total_cost = sum(float(t.get('price', 0)) * float(t.get('size', 0)) for t in trade_list)
+    def calc_totals(side, outcome):
+        count, total_shares, total_cost = category_totals[(side, outcome)]
         avg_price = total_cost / total_shares if total_shares > 0 else 0
-        return total_shares, total_cost, avg_price, len(trade_list)
+        return total_shares, total_cost, avg_price, count
     
-    buy_up_sh, buy_up_cost, buy_up_avg, buy_up_count = calc_totals(buy_up)
-    buy_down_sh, buy_down_cost, buy_down_avg, buy_down_count = calc_totals(buy_down)
-    sell_up_sh, sell_up_cost, sell_up_avg, sell_up_count = calc_totals(sell_up)
-    sell_down_sh, sell_down_cost, sell_down_avg, sell_down_count = calc_totals(sell_down)
+    buy_up_sh, buy_up_cost, buy_up_avg, buy_up_count = calc_totals('BUY', 'up')
+    buy_down_sh, buy_down_cost, buy_down_avg, buy_down_count = calc_totals('BUY', 'down')
+    sell_up_sh, sell_up_cost, sell_up_avg, sell_up_count = calc_totals('SELL', 'up')
+    sell_down_sh, sell_down_cost, sell_down_avg, sell_down_count = calc_totals('SELL', 'down')
     
     # Net position
     net_up_shares = buy_up_sh - sell_up_sh
     net_down_shares = buy_down_sh - sell_down_sh
     net_exposure = (buy_up_cost + buy_down_cost) - (sell_up_cost + sell_down_cost)
     
-    # Price distribution analysis
-    up_prices = [float(t.get('price', 0)) for t in up_trades]
-    down_prices = [float(t.get('price', 0)) for t in down_trades]
-    
-    # Time-based analysis
-    trades_by_minute = defaultdict(list)
-    for t in trades_sorted:
-        ts = t.get('timestamp', 0)
-        if ts:
-            dt = datetime.datetime.fromtimestamp(ts)
-            minute_key = dt.strftime('%H:%M')
-            trades_by_minute[minute_key].append(t)
-    
-    # Print comprehensive report
-    print("=" * 80)
-    print("TRADE ANALYSIS REPORT")
-    print("=" * 80)
-    print(f"\nMarket: {trades[0].get('title', 'Unknown')}")
-    print(f"Total Trades: {total_trades}")
-    print(f"Unique Timestamps: {unique_timestamps}")
-    
-    if start_time and end_time:
-        print(f"\nTime Range:")
-        print(f"  Start: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"  End:   {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"  Duration: {duration}")
-    
-    print(f"\n{'=' * 80}")
-    print("TRADE BREAKDOWN BY TYPE")
-    print(f"{'=' * 80}")
-    print(f"\nBUY Trades:")
-    print(f"  Total: {len(buy_trades)}")
-    print(f"  Up (YES):   {buy_up_count:4d} trades | {buy_up_sh:8.2f} shares | ${buy_up_cost:10.2f} | Avg: ${buy_up_avg:.4f}")
-    print(f"  Down (NO):  {buy_down_count:4d} trades | {buy_down_sh:8.2f} shares | ${buy_down_cost:10.2f} | Avg: ${buy_down_avg:.4f}")
-    
-    print(f"\nSELL Trades:")
-    print(f"  Total: {len(sell_trades)}")
-    print(f"  Up (YES):   {sell_up_count:4d} trades | {sell_up_sh:8.2f} shares | ${sell_up_cost:10.2f} | Avg: ${sell_up_avg:.4f}")
-    print(f"  Down (NO):  {sell_down_count:4d} trades | {sell_down_sh:8.2f} shares | ${sell_down_cost:10.2f} | Avg: ${sell_down_avg:.4f}")
-    
-    print(f"\n{'=' * 80}")
-    print("NET POSITION")
-    print(f"{'=' * 80}")
-    print(f"  Up (YES) shares:   {net_up_shares:8.2f}")
-    print(f"  Down (NO) shares:  {net_down_shares:8.2f}")
-    print(f"  Net exposure:      ${net_exposure:10.2f}")
-    
-    print(f"\n{'=' * 80}")
-    print("PRICE STATISTICS")
-    print(f"{'=' * 80}")
-    if prices:
-        print(f"\nAll Trades:")
-        print(f"  Min:  ${min(prices):.4f}")
-        print(f"  Max:  ${max(prices):.4f}")
-        print(f"  Mean: ${mean(prices):.4f}")
-        print(f"  Median: ${median(prices):.4f}")
-        if len(prices) > 1:
-            print(f"  Std Dev: ${stdev(prices):.4f}")
-    
-    if up_prices:
-        print(f"\nUp (YES) Trades:")
-        print(f"  Min:  ${min(up_prices):.4f}")
-        print(f"  Max:  ${max(up_prices):.4f}")
-        print(f"  Mean: ${mean(up_prices):.4f}")
-        print(f"  Median: ${median(up_prices):.4f}")
-        if len(up_prices) > 1:
-            print(f"  Std Dev: ${stdev(up_prices):.4f}")
-    
-    if down_prices:
-        print(f"\nDown (NO) Trades:")
-        print(f"  Min:  ${min(down_prices):.4f}")
-        print(f"  Max:  ${max(down_prices):.4f}")
-        print(f"  Mean: ${mean(down_prices):.4f}")
-        print(f"  Median: ${median(down_prices):.4f}")
-        if len(down_prices) > 1:
-            print(f"  Std Dev: ${stdev(down_prices):.4f}")
-    
-    print(f"\n{'=' * 80}")
-    print("VOLUME STATISTICS")
-    print(f"{'=' * 80}")
-    if sizes:
-        print(f"  Total Shares: {sum(sizes):.2f}")
-        print(f"  Total Cost:   ${sum(costs):.2f}")
-        print(f"  Avg Trade Size: {mean(sizes):.2f} shares")
-        print(f"  Avg Trade Cost:  ${mean(costs):.2f}")
-        print(f"  Min Trade Size:  {min(sizes):.2f} shares")
-        print(f"  Max Trade Size:  {max(sizes):.2f} shares")
-    
-    print(f"\n{'=' * 80}")
-    print("TRADING ACTIVITY BY MINUTE")
-    print(f"{'=' * 80}")
-    if trades_by_minute:
-        sorted_minutes = sorted(trades_by_minute.items())
-        print(f"\n{'Minute':<10} {'Trades':<10} {'Shares':<15} {'Cost ($)':<15}")
-        print("-" * 50)
-        for minute, minute_trades in sorted_minutes[:20]:  # Show first 20 minutes
-            total_shares = sum(float(t.get('size', 0)) for t in minute_trades)
-            total_cost = sum(float(t.get('price', 0)) * float(t.get('size', 0)) for t in minute_trades)
-            print(f"{minute:<10} {len(minute_trades):<10} {total_shares:<15.2f} ${total_cost:<14.2f}")
+    # Build the report as lines and write it out in one call
+    out = []
+    w = out.append
+    w("=" * 80)
+    w("TRADE ANALYSIS REPORT")
+    w("=" * 80)
+    if want_basic:
+        w(f"\nMarket: {title}")
+        w(f"Total Trades: {total_trades}")
+        w(f"Unique Timestamps: {unique_timestamps}")
+        
+        if start_time and end_time:
+            w(f"\nTime Range:")
+            w(f"  Start: {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            w(f"  End:   {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+            w(f"  Duration: {duration}")
+    
+    if want_breakdown:
+        w(f"\n{'=' * 80}")
+        w("TRADE BREAKDOWN BY TYPE")
+        w(f"{'=' * 80}")
+        w(f"\nBUY Trades:")
+        w(f"  Total: {side_counts['BUY']}")
+        w(f"  Up (YES):   {buy_up_count:4d} trades | {buy_up_sh:8.2f} shares | ${buy_up_cost:10.2f} | Avg: ${buy_up_avg:.4f}")
+        w(f"  Down (NO):  {buy_down_count:4d} trades | {buy_down_sh:8.2f} shares | ${buy_down_cost:10.2f} | Avg: ${buy_down_avg:.4f}")
+        
+        w(f"\nSELL Trades:")
+        w(f"  Total: {side_counts['SELL']}")
+        w(f"  Up (YES):   {sell_up_count:4d} trades | {sell_up_sh:8.2f} shares | ${sell_up_cost:10.2f} | Avg: ${sell_up_avg:.4f}")
+        w(f"  Down (NO):  {sell_down_count:4d} trades | {sell_down_sh:8.2f} shares | ${sell_down_cost:10.2f} | Avg: ${sell_down_avg:.4f}")
+        
+        w(f"\n{'=' * 80}")
+        w("NET POSITION")
+        w(f"{'=' * 80}")
+        w(f"  Up (YES) shares:   {net_up_shares:8.2f}")
+        w(f"  Down (NO) shares:  {net_down_shares:8.2f}")
+        w(f"  Net exposure:      ${net_exposure:10.2f}")
+    
+    if want_prices:
+        w(f"\n{'=' * 80}")
+        w("PRICE STATISTICS")
+        w(f"{'=' * 80}")
+        if prices.size:
+            w(f"\nAll Trades:")
+            w(f"  Min:  ${prices.min():.4f}")
+            w(f"  Max:  ${prices.max():.4f}")
+            w(f"  Mean: ${prices.mean():.4f}")
+            w(f"  Median: ${np.median(prices):.4f}")
+            if prices.size > 1:
+                w(f"  Std Dev: ${prices.std(ddof=1):.4f}")
+        
+        if up_prices.size:
+            w(f"\nUp (YES) Trades:")
+            w(f"  Min:  ${up_prices.min():.4f}")
+            w(f"  Max:  ${up_prices.max():.4f}")
+            w(f"  Mean: ${up_prices.mean():.4f}")
+            w(f"  Median: ${np.median(up_prices):.4f}")
+            if up_prices.size > 1:
+                w(f"  Std Dev: ${up_prices.std(ddof=1):.4f}")
         
-        if len(sorted_minutes) > 20:
-            print(f"\n... and {len(sorted_minutes) - 20} more minutes")
+        if down_prices.size:
+            w(f"\nDown (NO) Trades:")
+            w(f"  Min:  ${down_prices.min():.4f}")
+            w(f"  Max:  ${down_prices.max():.4f}")
+            w(f"  Mean: ${down_prices.mean():.4f}")
+            w(f"  Median: ${np.median(down_prices):.4f}")
+            if down_prices.size > 1:
+                w(f"  Std Dev: ${down_prices.std(ddof=1):.4f}")
+    
+    if want_volume:
+        w(f"\n{'=' * 80}")
+        w("VOLUME STATISTICS")
+        w(f"{'=' * 80}")
+        if sizes.size:
+            w(f"  Total Shares: {sizes.sum():.2f}")
+            w(f"  Total Cost:   ${costs.sum():.2f}")
+            w(f"  Avg Trade Size: {sizes.mean():.2f} shares")
+            w(f"  Avg Trade Cost:  ${costs.mean():.2f}")
+            w(f"  Min Trade Size:  {sizes.min():.2f} shares")
+            w(f"  Max Trade Size:  {sizes.max():.2f} shares")
+    
+    if want_minute:
+        w(f"\n{'=' * 80}")
+        w("TRADING ACTIVITY BY MINUTE")
+        w(f"{'=' * 80}")
+        if trades_by_minute:
+            sorted_minutes = sorted(trades_by_minute.items())
+            w(f"\n{'Minute':<10} {'Trades':<10} {'Shares':<15} {'Cost ($)':<15}")
+            w("-" * 50)
+            for minute, (count, total_shares, total_cost) in sorted_minutes[:20]:  # Show first 20 minutes
+                minute_label = datetime.datetime.fromtimestamp(minute * 60).strftime('%H:%M')
+                w(f"{minute_label:<10} {count:<10} {total_shares:<15.2f} ${total_cost:<14.2f}")
+        
+            if len(sorted_minutes) > 20:
+                w(f"\n... and {len(sorted_minutes) - 20} more minutes")
     
     # Price movement analysis
-    print(f"\n{'=' * 80}")
-    print("PRICE MOVEMENT ANALYSIS")
-    print(f"{'=' * 80}")
-    
-    # Group trades by outcome and analyze price trends
-    up_trades_sorted = sorted([t for t in trades_sorted if t.get('outcome', '').lower() == 'up'], 
-                              key=lambda x: x.get('timestamp', 0))
-    down_trades_sorted = sorted([t for t in trades_sorted if t.get('outcome', '').lower() == 'down'], 
-                               key=lambda x: x.get('timestamp', 0))
-    
-    if up_trades_sorted:
-        first_up_price = float(up_trades_sorted[0].get('price', 0))
-        last_up_price = float(up_trades_sorted[-1].get('price', 0))
-        up_change = last_up_price - first_up_price
-        up_change_pct = (up_change / first_up_price * 100) if first_up_price > 0 else 0
-        print(f"\nUp (YES) Price Movement:")
-        print(f"  First: ${first_up_price:.4f}")
-        print(f"  Last:  ${last_up_price:.4f}")
-        print(f"  Change: ${up_change:.4f} ({up_change_pct:+.2f}%)")
-    
-    if down_trades_sorted:
-        first_down_price = float(down_trades_sorted[0].get('price', 0))
-        last_down_price = float(down_trades_sorted[-1].get('price', 0))
-        down_change = last_down_price - first_down_price
-        down_change_pct = (down_change / first_down_price * 100) if first_down_price > 0 else 0
-        print(f"\nDown (NO) Price Movement:")
-        print(f"  First: ${first_down_price:.4f}")
-        print(f"  Last:  ${last_down_price:.4f}")
-        print(f"  Change: ${down_change:.4f} ({down_change_pct:+.2f}%)")
-    
-    # Combined price analysis (arbitrage opportunity)
-    if up_trades_sorted and down_trades_sorted:
-        print(f"\nCombined Price Analysis:")
-        first_combined = first_up_price + first_down_price
-        last_combined = last_up_price + last_down_price
-        combined_change = last_combined - first_combined
-        print(f"  First Combined: ${first_combined:.4f}")
-        print(f"  Last Combined:  ${last_combined:.4f}")
-        print(f"  Change: ${combined_change:.4f}")
-        if first_combined < 1.0:
-            arb_opp_first = 1.0 - first_combined
-            print(f"  Arbitrage Opportunity (first): ${arb_opp_first:.4f} ({arb_opp_first/first_combined*100:.2f}%)")
-        if last_combined < 1.0:
-            arb_opp_last = 1.0 - last_combined
-            print(f"  Arbitrage Opportunity (last): ${arb_opp_last:.4f} ({arb_opp_last/last_combined*100:.2f}%)")
-    
-    print(f"\n{'=' * 80}")
-    print("TRANSACTION ANALYSIS")
-    print(f"{'=' * 80}")
-    
-    # Unique transaction hashes
-    unique_txns = set(t.get('transactionHash', '') for t in trades if t.get('transactionHash'))
-    print(f"\nUnique Transactions: {len(unique_txns)}")
-    
-    # Trades per transaction
-    txn_counts = defaultdict(int)
-    for t in trades:
-        tx_hash = t.get('transactionHash', '')
-        if tx_hash:
-            txn_counts[tx_hash] += 1
+    if want_movement:
+        w(f"\n{'=' * 80}")
+        w("PRICE MOVEMENT ANALYSIS")
+        w(f"{'=' * 80}")
+        
+        # Group trades by outcome and analyze price trends
+        # (filtering the timestamp-ordered indices keeps them in order)
+        up_trades_sorted = [i for i in order if outcomes[i] == 'up']
+        down_trades_sorted = [i for i in order if outcomes[i] == 'down']
+        
+        if up_trades_sorted:
+            first_up_price = prices[up_trades_sorted[0]]
+            last_up_price = prices[up_trades_sorted[-1]]
+        if down_trades_sorted:
+            first_down_price = prices[down_trades_sorted[0]]
+            last_down_price = prices[down_trades_sorted[-1]]
+        
+        if up_trades_sorted and 'movement' in sections:
+            up_change = last_up_price - first_up_price
+            up_change_pct = (up_change / first_up_price * 100) if first_up_price > 0 else 0
+            w(f"\nUp (YES) Price Movement:")
+            w(f"  First: ${first_up_price:.4f}")
+            w(f"  Last:  ${last_up_price:.4f}")
+            w(f"  Change: ${up_change:.4f} ({up_change_pct:+.2f}%)")
+        
+        if down_trades_sorted and 'movement' in sections:
+            down_change = last_down_price - first_down_price
+            down_change_pct = (down_change / first_down_price * 100) if first_down_price > 0 else 0
+            w(f"\nDown (NO) Price Movement:")
+            w(f"  First: ${first_down_price:.4f}")
+            w(f"  Last:  ${last_down_price:.4f}")
+            w(f"  Change: ${down_change:.4f} ({down_change_pct:+.2f}%)")
+        
+        # Combined price analysis (arbitrage opportunity)
+        if up_trades_sorted and down_trades_sorted and 'arb' in sections:
+            w(f"\nCombined Price Analysis:")
+            first_combined = first_up_price + first_down_price
+            last_combined = last_up_price + last_down_price
+            combined_change = last_combined - first_combined
+            w(f"  First Combined: ${first_combined:.4f}")
+            w(f"  Last Combined:  ${last_combined:.4f}")
+            w(f"  Change: ${combined_change:.4f}")
+            if first_combined < 1.0:
+                arb_opp_first = 1.0 - first_combined
+                w(f"  Arbitrage Opportunity (first): ${arb_opp_first:.4f} ({arb_opp_first/first_combined*100:.2f}%)")
+            if last_combined < 1.0:
+                arb_opp_last = 1.0 - last_combined
+                w(f"  Arbitrage Opportunity (last): ${arb_opp_last:.4f} ({arb_opp_last/last_combined*100:.2f}%)")
+    
+    if want_txn:
+        w(f"\n{'=' * 80}")
+        w("TRANSACTION ANALYSIS")
+        w(f"{'=' * 80}")
+        
+        # Trades per transaction; its keys are the unique transaction hashes
+        txn_counts = Counter(tx_hash for tx_hash in tx_hashes if tx_hash)
+        w(f"\nUnique Transactions: {len(txn_counts)}")
+        
+        if txn_counts:
+            avg_trades_per_txn = sum(txn_counts.values()) / len(txn_counts)
+            max_trades_per_txn = max(txn_counts.values())
+            w(f"  Avg trades per transaction: {avg_trades_per_txn:.2f}")
+            w(f"  Max trades per transaction: {max_trades_per_txn}")
     
-    if txn_counts:
-        avg_trades_per_txn = mean(txn_counts.values())
-        max_trades_per_txn = max(txn_counts.values())
-        print(f"  Avg trades per transaction: {avg_trades_per_txn:.2f}")
-        print(f"  Max trades per transaction: {max_trades_per_txn}")
+    w("\n" + "=" * 80)
     
-    print("\n" + "=" * 80)
+    sys.stdout.write('\n'.join(out) + '\n')
 
 def main():
-    filename = sys.argv[1] if len(sys.argv) > 1 else "trades.json"
+    # Optional --sections=basic,arb selects report sections; like the other
+    # scripts, the first positional argument is the trades file
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--sections=')]
+    options = [arg for arg in sys.argv[1:] if arg.startswith('--sections=')]
+    filename = args[0] if args else "trades.json"
+    
+    sections = SECTIONS
+    if options:
+        sections = {name for name in options[-1][len('--sections='):].split(',') if name}
+        unknown = sections - SECTIONS
+        if unknown or not sections:
+            if unknown:
+                print(f"Error: Unknown report sections: {', '.join(sorted(unknown))}")
+            else:
+                print("Error: --sections needs at least one section")
+            print(f"Valid sections: {', '.join(sorted(SECTIONS))}")
+            return
+    
     try:
-        trades = load_trades(filename)
-        analyze_trades(trades)
+        analyze_trades(trades_io.iter_trades(filename), sections=sections)
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
-    except json.JSONDecodeError:
+    except trades_io.JSON_ERRORS:
         print(f"Error: File '{filename}' is not valid JSON.")
     except Exception as e:
         print(f"Error: {e}")
@@ -3,23 +3,104 @@
 Arbitrage timing analysis - when were the best opportunities captured?
 """
 
-import json
 import datetime
-from collections import defaultdict
-import matplotlib.pyplot as plt
+import heapq
 import numpy as np
-import matplotlib.dates as mdates
 import sys
 
-def load_trades(filename="trades.json"):
-    """Load trades from JSON file"""
-    with open(filename, 'r', encoding='utf-8') as f:
-        return json.load(f)
+import trades_io
 
-def analyze_arbitrage_timing(trades, report_name=None):
-    """Analyze when arbitrage opportunities were captured"""
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Above this many arbitrage trades the scatter plot is binned with hexbin
+HEXBIN_THRESHOLD = 5000
+
+# Figure reused across calls to analyze_arbitrage_timing (batch report runs)
+_figure = {}
+
+def _arb_scan_numpy(price, is_up):
+    """Latest YES/NO prices and per-trade arbitrage via forward fill (NumPy)"""
+    
+    up_track = trades_io.forward_fill(price, is_up)
+    down_track = trades_io.forward_fill(price, ~is_up)
+    combined = up_track + down_track
+    
+    # NaN combined prices compare False, so they stay NaN here too
+    arb_opp = np.where((combined > 0) & (combined < 1.0), 1.0 - combined, np.nan)
+    arb_pct = (arb_opp / combined) * 100
     
-    if not trades:
+    return combined, arb_opp, arb_pct, up_track, down_track
+
+def _arb_scan_loop(price, is_up):
+    """Carry the latest YES/NO price forward and derive arbitrage per trade
+
+    Returns (combined, arb_opportunity, arb_percentage, up_price, down_price)
+    arrays. Entries are NaN until both sides have traded; the arbitrage
+    columns are also NaN unless the combined price is above $0 and below $1.00.
+    """
+    n = price.shape[0]
+    combined = np.full(n, np.nan)
+    arb_opp = np.full(n, np.nan)
+    arb_pct = np.full(n, np.nan)
+    up_track = np.full(n, np.nan)
+    down_track = np.full(n, np.nan)
+    
+    current_up = np.nan
+    current_down = np.nan
+    for i in range(n):
+        if is_up[i]:
+            current_up = price[i]
+        else:
+            current_down = price[i]
+        up_track[i] = current_up
+        down_track[i] = current_down
+        
+        if not np.isnan(current_up) and not np.isnan(current_down):
+            combined_price = current_up + current_down
+            combined[i] = combined_price
+            if 0 < combined_price < 1.0:
+                arb_opp[i] = 1.0 - combined_price
+                arb_pct[i] = (arb_opp[i] / combined_price) * 100
+    
+    return combined, arb_opp, arb_pct, up_track, down_track
+
+if njit is not None:
+    _arb_scan = njit('UniTuple(float64[:], 5)(float64[:], boolean[:])', cache=True)(_arb_scan_loop)
+else:
+    _arb_scan = _arb_scan_numpy
+
+def _timing_figure():
+    """Return the shared (fig, axes, ax3_twin), cleared for a new plot"""
+    import matplotlib.pyplot as plt
+    
+    if not _figure:
+        fig, axes = plt.subplots(3, 1, figsize=(16, 12))
+        _figure.update(fig=fig, axes=axes, cbar=None, twin=None)
+    
+    # The colorbar and twin axes are rebuilt each time; clear() would move
+    # the twin's ticks and label back to the left
+    if _figure['cbar'] is not None:
+        _figure['cbar'].remove()
+    if _figure['twin'] is not None:
+        _figure['twin'].remove()
+    for ax in _figure['axes']:
+        ax.clear()
+    _figure['cbar'] = None
+    # tight_layout starts from the current margins; reset them so a reused
+    # figure lays out exactly like a fresh one
+    _figure['fig'].subplots_adjust(**{k: plt.rcParams['figure.subplot.' + k]
+                                      for k in ('left', 'bottom', 'right', 'top', 'wspace', 'hspace')})
+    _figure['twin'] = _figure['axes'][2].twinx()
+    
+    return _figure['fig'], _figure['axes'], _figure['twin']
+
+def analyze_arbitrage_timing(data, report_name=None):
+    """Analyze when arbitrage opportunities were captured in trades_io.load() data"""
+    
+    if not data['timestamp'].size:
         print("No trades to analyze.")
         return
     
@@ -31,112 +112,73 @@ def analyze_arbitrage_timing(trades, report_name=None):
     else:
         output_file = "arbitrage_timing_analysis.png"
     
-    trades_sorted = sorted(trades, key=lambda x: x.get('timestamp', 0))
-    
-    # Track prices over time
-    up_prices = {}
-    down_prices = {}
-    timestamps = []
-    
-    for t in trades_sorted:
-        ts = t.get('timestamp', 0)
-        if ts:
-            dt = datetime.datetime.fromtimestamp(ts)
-            timestamps.append(dt)
-            price = float(t.get('price', 0))
-            outcome = t.get('outcome', '').lower()
-            
-            if outcome == 'up':
-                up_prices[ts] = price
-            else:
-                down_prices[ts] = price
-    
-    # Calculate combined prices and arbitrage opportunities for each trade
-    trade_analysis = []
-    current_up_price = None
-    current_down_price = None
-    
-    for t in trades_sorted:
-        ts = t.get('timestamp', 0)
-        if not ts:
-            continue
-            
-        price = float(t.get('price', 0))
-        size = float(t.get('size', 0))
-        outcome = t.get('outcome', '').lower()
-        cost = price * size
-        
-        # Update current prices
-        if outcome == 'up':
-            current_up_price = price
-        else:
-            current_down_price = price
-        
-        # Calculate combined price if we have both
-        combined_price = None
-        arb_opportunity = None
-        arb_percentage = None
-        
-        if current_up_price is not None and current_down_price is not None:
-            combined_price = current_up_price + current_down_price
-            if combined_price < 1.0:
-                arb_opportunity = 1.0 - combined_price
-                arb_percentage = (arb_opportunity / combined_price) * 100
-        
-        trade_analysis.append({
-            'timestamp': datetime.datetime.fromtimestamp(ts),
-            'outcome': outcome,
-            'price': price,
-            'size': size,
-            'cost': cost,
-            'combined_price': combined_price,
-            'arb_opportunity': arb_opportunity,
-            'arb_percentage': arb_percentage,
-            'up_price': current_up_price,
-            'down_price': current_down_price
-        })
-    
-    # Filter trades with arbitrage opportunities
-    arb_trades = [t for t in trade_analysis if t['arb_opportunity'] is not None and t['arb_opportunity'] > 0]
-    
-    # Group by time windows (every 30 seconds)
-    time_windows = defaultdict(lambda: {'trades': [], 'total_cost': 0, 'total_shares': 0, 'avg_arb': 0, 'max_arb': 0})
-    
-    for t in arb_trades:
-        # Round to nearest 30 seconds
-        ts = t['timestamp']
-        rounded_ts = ts.replace(second=(ts.second // 30) * 30, microsecond=0)
-        time_windows[rounded_ts]['trades'].append(t)
-        time_windows[rounded_ts]['total_cost'] += t['cost']
-        time_windows[rounded_ts]['total_shares'] += t['size']
-        time_windows[rounded_ts]['avg_arb'] = mean([tr['arb_opportunity'] for tr in time_windows[rounded_ts]['trades']])
-        time_windows[rounded_ts]['max_arb'] = max([tr['arb_opportunity'] for tr in time_windows[rounded_ts]['trades']])
-    
-    # Create visualization
-    fig, axes = plt.subplots(3, 1, figsize=(16, 12))
+    # Columns come sorted by timestamp, equal timestamps in file order;
+    # the analysis covers the trades that have a timestamp
+    timed = data['timestamp'] != 0
+    epochs = data['timestamp'][timed]
+    trade_prices = data['price'][timed]
+    trade_sizes = data['size'][timed]
+    trade_costs = trade_prices * trade_sizes
+    trade_is_up = data['outcome_up'][timed]
+    # Converted once; every plot and report below indexes into this list
+    trade_times = [datetime.datetime.fromtimestamp(ts) for ts in epochs.tolist()]
+    
+    combined, arb_opp, arb_pct, up_track, down_track = _arb_scan(trade_prices, trade_is_up)
+    
+    # Indices of trades with arbitrage opportunities (NaN compares False)
+    arb_idx = np.flatnonzero(arb_opp > 0)
+    arb_epochs = epochs[arb_idx]
+    arb_opps = arb_opp[arb_idx]
+    arb_costs = trade_costs[arb_idx]
+    
+    # Group by time windows (every 30 seconds). Trades are in timestamp
+    # order, so each window is a contiguous run reduced with reduceat.
+    # Windows are kept as epoch seconds; they become datetimes only when reported
+    arb_windows = (arb_epochs // 30) * 30
+    window_starts = np.flatnonzero(np.diff(arb_windows, prepend=arb_windows[:1] - 1))
+    window_times = arb_windows[window_starts]
+    window_costs = np.add.reduceat(arb_costs, window_starts)
+    window_trade_counts = np.diff(np.append(window_starts, arb_idx.size))
+    window_avg_arb = np.add.reduceat(arb_opps, window_starts) / window_trade_counts
+    
+    # Create visualization. matplotlib is only imported here, so importing
+    # this module for the arbitrage scan stays cheap
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    import matplotlib.dates as mdates
+    
+    # Matplotlib date numbers for plotting, so the axes get floats directly
+    trade_nums = mdates.date2num(trade_times)
+    
+    fig, axes, ax3_twin = _timing_figure()
     fig.suptitle('Arbitrage Timing Analysis', fontsize=16, fontweight='bold')
     
     # 1. Arbitrage opportunity over time
     ax1 = axes[0]
-    arb_times = [t['timestamp'] for t in arb_trades]
-    arb_opps = [t['arb_opportunity'] for t in arb_trades]
-    arb_percs = [t['arb_percentage'] for t in arb_trades]
+    arb_times = trade_nums[arb_idx]
+    arb_percs = arb_pct[arb_idx]
     
-    scatter = ax1.scatter(arb_times, arb_opps, c=arb_percs, cmap='RdYlGn', 
-                         s=50, alpha=0.6, edgecolors='black', linewidth=0.5)
+    if arb_idx.size > HEXBIN_THRESHOLD:
+        scatter = ax1.hexbin(arb_times, arb_opps, C=arb_percs, gridsize=100,
+                             reduce_C_function=np.mean, cmap='RdYlGn')
+    else:
+        scatter = ax1.scatter(arb_times, arb_opps, c=arb_percs, cmap='RdYlGn', 
+                             s=50, alpha=0.6, edgecolors='black', linewidth=0.5,
+                             rasterized=True)
     ax1.set_xlabel('Time', fontsize=11)
     ax1.set_ylabel('Arbitrage Opportunity ($)', fontsize=11)
     ax1.set_title('Arbitrage Opportunities Captured Over Time', fontsize=12, fontweight='bold')
     ax1.grid(True, alpha=0.3)
     ax1.axhline(y=0, color='black', linestyle='-', linewidth=0.5)
-    cbar = plt.colorbar(scatter, ax=ax1)
+    cbar = _figure['cbar'] = fig.colorbar(scatter, ax=ax1)
     cbar.set_label('Arbitrage %', fontsize=10)
     ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
     ax1.xaxis.set_major_locator(mdates.SecondLocator(interval=60))
     plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
     
     # Add annotation for best opportunities
-    if arb_opps:
+    if arb_idx.size:
         top_5_indices = np.argsort(arb_opps)[-5:][::-1]
         for idx in top_5_indices[:3]:  # Annotate top 3
             ax1.annotate(f"${arb_opps[idx]:.4f}\n({arb_percs[idx]:.1f}%)",
@@ -147,13 +189,14 @@ def analyze_arbitrage_timing(trades, report_name=None):
     
     # 2. Combined price over time
     ax2 = axes[1]
-    combined_times = [t['timestamp'] for t in trade_analysis if t['combined_price'] is not None]
-    combined_prices = [t['combined_price'] for t in trade_analysis if t['combined_price'] is not None]
+    combined_mask = ~np.isnan(combined)
+    combined_times = trade_nums[combined_mask]
+    combined_prices = combined[combined_mask]
     
     ax2.plot(combined_times, combined_prices, color='blue', linewidth=2, alpha=0.7, label='Combined Price')
     ax2.axhline(y=1.0, color='red', linestyle='--', linewidth=2, label='Parity ($1.00)')
     ax2.fill_between(combined_times, combined_prices, 1.0, 
-                     where=[cp < 1.0 for cp in combined_prices],
+                     where=combined_prices < 1.0,
                      color='green', alpha=0.3, label='Arbitrage Zone')
     ax2.set_xlabel('Time', fontsize=11)
     ax2.set_ylabel('Combined Price ($)', fontsize=11)
@@ -168,16 +211,9 @@ def analyze_arbitrage_timing(trades, report_name=None):
     # 3. Trading activity and arbitrage capture efficiency
     ax3 = axes[2]
     
-    window_times = sorted(time_windows.keys())
-    window_costs = [time_windows[t]['total_cost'] for t in window_times]
-    window_avg_arb = [time_windows[t]['avg_arb'] * 1000 for t in window_times]  # Scale for visibility
-    window_trade_counts = [len(time_windows[t]['trades']) for t in window_times]
-    
-    ax3_twin = ax3.twinx()
-    
     bars = ax3.bar(range(len(window_times)), window_costs, alpha=0.6, color='steelblue', 
                    edgecolor='black', label='Cost per 30s Window')
-    line = ax3_twin.plot(range(len(window_times)), window_avg_arb, color='red', 
+    line = ax3_twin.plot(range(len(window_times)), window_avg_arb * 1000, color='red', 
                         linewidth=2, marker='o', markersize=4, label='Avg Arb Opp (×1000)')
     
     ax3.set_xlabel('Time Window (30s intervals)', fontsize=11)
@@ -188,7 +224,7 @@ def analyze_arbitrage_timing(trades, report_name=None):
     ax3.tick_params(axis='y', labelcolor='steelblue')
     ax3_twin.tick_params(axis='y', labelcolor='red')
     ax3.set_xticks(range(len(window_times)))
-    ax3.set_xticklabels([t.strftime('%H:%M:%S') for t in window_times], 
+    ax3.set_xticklabels([datetime.datetime.fromtimestamp(t).strftime('%H:%M:%S') for t in window_times.tolist()], 
                         rotation=45, ha='right', fontsize=8)
     ax3.grid(True, alpha=0.3, axis='y')
     
@@ -204,76 +240,74 @@ def analyze_arbitrage_timing(trades, report_name=None):
     lines2, labels2 = ax3_twin.get_legend_handles_labels()
     ax3.legend(lines1 + lines2, labels1 + labels2, loc='upper left')
     
-    plt.tight_layout()
-    plt.savefig(output_file, dpi=200, bbox_inches='tight')
+    fig.tight_layout()
+    fig.savefig(output_file, dpi=120, bbox_inches='tight')
     print(f"Arbitrage timing analysis saved as '{output_file}'")
-    plt.close()
     
     # Print timing insights
     print("\n" + "="*80)
     print("ARBITRAGE TIMING INSIGHTS")
     print("="*80)
     
-    if arb_trades:
-        best_arb_trade = max(arb_trades, key=lambda x: x['arb_opportunity'])
-        worst_arb_trade = min([t for t in arb_trades if t['arb_opportunity'] > 0], 
-                              key=lambda x: x['arb_opportunity'])
+    if arb_idx.size:
+        # All arbitrage opportunities are > 0, so the minimum is still profitable
+        best = arb_idx[np.argmax(arb_opps)]
+        worst = arb_idx[np.argmin(arb_opps)]
         
         print(f"\nBest Arbitrage Opportunity Captured:")
-        print(f"  Time: {best_arb_trade['timestamp'].strftime('%H:%M:%S')}")
-        print(f"  Opportunity: ${best_arb_trade['arb_opportunity']:.4f} ({best_arb_trade['arb_percentage']:.2f}%)")
-        print(f"  Combined Price: ${best_arb_trade['combined_price']:.4f}")
-        print(f"  YES Price: ${best_arb_trade['up_price']:.4f} | NO Price: ${best_arb_trade['down_price']:.4f}")
-        print(f"  Trade Size: {best_arb_trade['size']:.2f} shares | Cost: ${best_arb_trade['cost']:.2f}")
+        print(f"  Time: {trade_times[best].strftime('%H:%M:%S')}")
+        print(f"  Opportunity: ${arb_opp[best]:.4f} ({arb_pct[best]:.2f}%)")
+        print(f"  Combined Price: ${combined[best]:.4f}")
+        print(f"  YES Price: ${up_track[best]:.4f} | NO Price: ${down_track[best]:.4f}")
+        print(f"  Trade Size: {trade_sizes[best]:.2f} shares | Cost: ${trade_costs[best]:.2f}")
         
         print(f"\nWorst Arbitrage Opportunity (still profitable):")
-        print(f"  Time: {worst_arb_trade['timestamp'].strftime('%H:%M:%S')}")
-        print(f"  Opportunity: ${worst_arb_trade['arb_opportunity']:.4f} ({worst_arb_trade['arb_percentage']:.2f}%)")
-        print(f"  Combined Price: ${worst_arb_trade['combined_price']:.4f}")
+        print(f"  Time: {trade_times[worst].strftime('%H:%M:%S')}")
+        print(f"  Opportunity: ${arb_opp[worst]:.4f} ({arb_pct[worst]:.2f}%)")
+        print(f"  Combined Price: ${combined[worst]:.4f}")
         
-        # Time-based efficiency
-        early_trades = [t for t in arb_trades if t['timestamp'] < arb_trades[len(arb_trades)//3]['timestamp']]
-        mid_trades = [t for t in arb_trades if arb_trades[len(arb_trades)//3]['timestamp'] <= t['timestamp'] < arb_trades[2*len(arb_trades)//3]['timestamp']]
-        late_trades = [t for t in arb_trades if t['timestamp'] >= arb_trades[2*len(arb_trades)//3]['timestamp']]
+        # Time-based efficiency: split at the timestamps a third and two thirds
+        # in. The trades are time-ordered, so each period is a slice; trades
+        # sharing a cut timestamp all start the later period
+        n_arb = arb_idx.size
+        early_end, mid_end = np.searchsorted(
+            arb_epochs, arb_epochs[[n_arb // 3, 2 * n_arb // 3]], side='left').tolist()
+        periods = [
+            ('Early', slice(0, early_end)),
+            ('Mid', slice(early_end, mid_end)),
+            ('Late', slice(mid_end, n_arb)),
+        ]
         
         print(f"\nTiming Efficiency Analysis:")
-        print(f"  Early Period ({len(early_trades)} trades):")
-        if early_trades:
-            print(f"    Avg Arb Opp: ${mean([t['arb_opportunity'] for t in early_trades]):.4f}")
-            print(f"    Total Cost: ${sum([t['cost'] for t in early_trades]):.2f}")
-        print(f"  Mid Period ({len(mid_trades)} trades):")
-        if mid_trades:
-            print(f"    Avg Arb Opp: ${mean([t['arb_opportunity'] for t in mid_trades]):.4f}")
-            print(f"    Total Cost: ${sum([t['cost'] for t in mid_trades]):.2f}")
-        print(f"  Late Period ({len(late_trades)} trades):")
-        if late_trades:
-            print(f"    Avg Arb Opp: ${mean([t['arb_opportunity'] for t in late_trades]):.4f}")
-            print(f"    Total Cost: ${sum([t['cost'] for t in late_trades]):.2f}")
+        for label, period in periods:
+            count = period.stop - period.start
+            print(f"  {label} Period ({count} trades):")
+            if count:
+                print(f"    Avg Arb Opp: ${arb_opps[period].mean():.4f}")
+                print(f"    Total Cost: ${arb_costs[period].sum():.2f}")
         
         # Best time windows
         print(f"\nTop 5 Time Windows by Arbitrage Opportunity:")
-        sorted_windows = sorted(time_windows.items(), key=lambda x: x[1]['avg_arb'], reverse=True)
-        for i, (window_time, data) in enumerate(sorted_windows[:5], 1):
-            print(f"  {i}. {window_time.strftime('%H:%M:%S')}: "
-                  f"Avg Arb ${data['avg_arb']:.4f} | "
-                  f"{len(data['trades'])} trades | "
-                  f"${data['total_cost']:.2f} cost")
+        # nlargest is stable like sorted(reverse=True): ties stay chronological
+        top_windows = heapq.nlargest(5, range(window_times.size), key=window_avg_arb.tolist().__getitem__)
+        for i, w in enumerate(top_windows, 1):
+            print(f"  {i}. {datetime.datetime.fromtimestamp(int(window_times[w])).strftime('%H:%M:%S')}: "
+                  f"Avg Arb ${window_avg_arb[w]:.4f} | "
+                  f"{window_trade_counts[w]} trades | "
+                  f"${window_costs[w]:.2f} cost")
     
     print("\n" + "="*80)
 
-def mean(lst):
-    return sum(lst) / len(lst) if lst else 0
-
 def main():
     filename = sys.argv[1] if len(sys.argv) > 1 else "trades.json"
     report_name = sys.argv[2] if len(sys.argv) > 2 else None
     
     try:
-        trades = load_trades(filename)
-        analyze_arbitrage_timing(trades, report_name)
+        data = trades_io.load(filename)
+        analyze_arbitrage_timing(data, report_name)
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
-    except json.JSONDecodeError:
+    except trades_io.JSON_ERRORS:
         print(f"Error: File '{filename}' is not valid JSON.")
     except Exception as e:
         print(f"Error: {e}")
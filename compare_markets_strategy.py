@@ -4,192 +4,319 @@ Compare trading strategies across multiple markets
 Analyze order placement timing and patterns
 """
 
-import json
 import os
 import datetime
-from collections import defaultdict
-import matplotlib.pyplot as plt
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
-import matplotlib.dates as mdates
 
-def load_trades(filename):
-    """Load trades from JSON file"""
-    with open(filename, 'r', encoding='utf-8') as f:
-        return json.load(f)
+import trades_io
 
-def analyze_order_timing(trades, market_start_time):
-    """Analyze when orders are placed relative to market start"""
-    if not trades:
-        return {}
-    
-    trades_sorted = sorted(trades, key=lambda x: x.get('timestamp', 0))
-    
-    # Get first trade timestamp (when bot started trading)
-    first_trade_time = trades_sorted[0].get('timestamp', 0)
-    if not first_trade_time:
-        return {}
-    
-    first_trade_dt = datetime.datetime.fromtimestamp(first_trade_time)
-    market_start_dt = datetime.datetime.fromtimestamp(market_start_time)
-    
-    # Calculate time from market start to first trade
-    time_to_first_trade = (first_trade_time - market_start_time) / 60.0  # minutes
-    
-    # Analyze trade distribution over time
-    time_buckets = defaultdict(int)  # seconds from market start
-    price_at_time = []
-    
-    for trade in trades_sorted:
-        ts = trade.get('timestamp', 0)
-        if ts:
-            seconds_from_start = ts - market_start_time
-            minutes_from_start = seconds_from_start / 60.0
-            
-            # Bucket by minute
-            bucket = int(minutes_from_start)
-            time_buckets[bucket] += 1
-            
-            price = float(trade.get('price', 0))
-            price_at_time.append({
-                'minutes_from_start': minutes_from_start,
-                'price': price,
-                'side': trade.get('outcome', '').lower()
-            })
-    
-    return {
-        'time_to_first_trade_minutes': time_to_first_trade,
-        'first_trade_time': first_trade_dt.strftime('%H:%M:%S'),
-        'market_start_time': market_start_dt.strftime('%H:%M:%S'),
-        'time_buckets': dict(time_buckets),
-        'price_at_time': price_at_time,
-        'total_trades': len(trades_sorted)
-    }
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
-def analyze_trading_pattern(trades):
-    """Analyze trading pattern characteristics"""
-    if not trades:
-        return {}
-    
-    trades_sorted = sorted(trades, key=lambda x: x.get('timestamp', 0))
-    
-    # Separate by side
-    yes_trades = [t for t in trades_sorted if t.get('outcome', '').lower() == 'up']
-    no_trades = [t for t in trades_sorted if t.get('outcome', '').lower() == 'down']
-    
-    # Analyze trade sizes
-    all_sizes = [float(t.get('size', 0)) for t in trades_sorted]
-    
-    # Analyze prices
-    yes_prices = [float(t.get('price', 0)) for t in yes_trades]
-    no_prices = [float(t.get('price', 0)) for t in no_trades]
+# The output is PNG only, so let Agg simplify and chunk long paths
+PNG_RC = {
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+}
+
+# Figure reused across calls to create_comparison_visualization
+_figure = {}
+
+REPORTS_DIR = 'reports'
+
+# Trade files are named after the market window, e.g. BTC_UpDown_9-00-915_trades.json
+MARKET_FILE_RE = re.compile(r'^(BTC_UpDown_(\d{1,2})-(\d{2})-(\d{1,2})(\d{2}))_trades\.json$')
+
+# Per-market plot colors, cycled when there are more markets
+MARKET_COLORS = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd', '#8c564b']
+
+def _market_stats_numpy(ts, size, price, is_up, is_down, market_start):
+    """Minute buckets, timestamp runs and size/price stats (NumPy)"""
+    
+    timestamps = ts[ts != 0]
+    buckets = np.trunc((timestamps - market_start) / 60.0).astype(np.int64)
+    first_bucket = int(buckets[0]) if buckets.size else 0
+    bucket_counts = np.bincount(buckets - first_bucket)
+    
+    _, timestamp_counts = np.unique(timestamps, return_counts=True)
+    yes_prices = price[is_up]
+    no_prices = price[is_down]
+    
+    counts = np.array([
+        (timestamp_counts > 1).sum(),
+        timestamp_counts.max() if timestamp_counts.size else 0,
+        yes_prices.size,
+        no_prices.size,
+    ], dtype=np.int64)
+    stats = np.array([
+        size.min(), size.max(), size.sum(),
+        np.min(yes_prices, initial=np.inf), np.max(yes_prices, initial=-np.inf), yes_prices.sum(),
+        np.min(no_prices, initial=np.inf), np.max(no_prices, initial=-np.inf), no_prices.sum(),
+    ])
+    
+    return first_bucket, bucket_counts, counts, stats
+
+def _market_stats_loop(ts, size, price, is_up, is_down, market_start):
+    """Single pass over the sorted columns of one market
+
+    Returns (first_bucket, bucket_counts, counts, stats): trades per minute
+    from market start (timed trades only), counts = [timestamps shared by
+    several trades, largest such group, YES trades, NO trades] and stats =
+    [size min, max, sum, YES price min, max, sum, NO price min, max, sum].
+    """
+    n = ts.shape[0]
+    counts = np.zeros(4, dtype=np.int64)
+    stats = np.array([np.inf, -np.inf, 0.0, np.inf, -np.inf, 0.0, np.inf, -np.inf, 0.0])
+    
+    first = -1
+    last = -1
+    run = 0
+    for i in range(n):
+        stats[0] = min(stats[0], size[i])
+        stats[1] = max(stats[1], size[i])
+        stats[2] += size[i]
+        if is_up[i]:
+            counts[2] += 1
+            stats[3] = min(stats[3], price[i])
+            stats[4] = max(stats[4], price[i])
+            stats[5] += price[i]
+        if is_down[i]:
+            counts[3] += 1
+            stats[6] = min(stats[6], price[i])
+            stats[7] = max(stats[7], price[i])
+            stats[8] += price[i]
+        
+        if ts[i] == 0:
+            continue
+        if first < 0:
+            first = i
+        
+        # ts is sorted, so equal timestamps form consecutive runs
+        if last >= 0 and ts[i] == ts[last]:
+            run += 1
+        else:
+            run = 1
+        if run == 2:
+            counts[0] += 1
+        if run > counts[1]:
+            counts[1] = run
+        last = i
+    
+    # Minute buckets (truncated toward zero) are sorted too, so the first
+    # and last timed trades bound them
+    if first < 0:
+        return 0, np.zeros(0, dtype=np.int64), counts, stats
+    first_bucket = int((ts[first] - market_start) / 60.0)
+    bucket_counts = np.zeros(int((ts[last] - market_start) / 60.0) - first_bucket + 1, dtype=np.int64)
+    for i in range(first, n):
+        if ts[i] != 0:
+            bucket_counts[int((ts[i] - market_start) / 60.0) - first_bucket] += 1
+    
+    return first_bucket, bucket_counts, counts, stats
+
+if njit is not None:
+    _market_stats = njit('Tuple((int64, int64[:], int64[:], float64[:]))'
+                         '(int64[:], float64[:], float64[:], boolean[:], boolean[:], float64)',
+                         cache=True)(_market_stats_loop)
+else:
+    _market_stats = _market_stats_numpy
+
+def _fmt_hms(ts):
+    """Format epoch time ts as local HH:MM:SS"""
+    return datetime.datetime.fromtimestamp(ts).strftime('%H:%M:%S')
+
+def _common_sizes(sizes, top=3):
+    """Most frequent sizes rounded to 0.1 as {size: count}, most common first
+
+    Ties keep the order in which the sizes first appear, as a running
+    dict count would.
+    """
+    values, first_seen, counts = np.unique(sizes, return_index=True, return_counts=True)
+    
+    # Round the few distinct sizes with Python's round(), which np.round
+    # does not always match, then merge the ones that round alike
+    keys, key_index = np.unique([round(size, 1) for size in values.tolist()], return_inverse=True)
+    key_counts = np.zeros(keys.size, dtype=np.int64)
+    np.add.at(key_counts, key_index, counts)
+    key_first_seen = np.full(keys.size, sizes.size, dtype=np.int64)
+    np.minimum.at(key_first_seen, key_index, first_seen)
+    
+    order = np.lexsort((key_first_seen, -key_counts))[:top]
+    return {float(keys[i]): int(key_counts[i]) for i in order}
+
+def analyze_market(columns, market_start_time):
+    """Analyze order timing and trading pattern from trades_io.load() columns
+
+    Returns (timing, pattern): when orders are placed relative to market
+    start, and the trading pattern characteristics. Either is an empty
+    dict when there is nothing to analyze.
+    """
+    timestamp = columns['timestamp']
+    price = columns['price']
+    all_sizes = columns['size']
+    if not all_sizes.size:
+        return {}, {}
+    
+    # Trades without a timestamp are left out of the timing analysis; the
+    # columns are sorted, so they are a prefix and the rest is a view
+    timestamps = timestamp[np.searchsorted(timestamp, 0, side='right'):]
+    
+    first_bucket, bucket_counts, counts, stats = _market_stats(
+        timestamp, all_sizes, price, columns['outcome_up'], columns['outcome_down'],
+        float(market_start_time))
+    simultaneous_trades, max_simultaneous, yes_trades, no_trades = counts.tolist()
+    size_min, size_max, size_sum, yes_min, yes_max, yes_sum, no_min, no_max, no_sum = stats.tolist()
+    
+    # Order timing. The first trade is when the bot started trading; a
+    # missing (zero) timestamp sorts first and leaves nothing to report
+    timing = {}
+    first_trade_time = int(timestamp[0])
+    if first_trade_time:
+        # Calculate time from market start to first trade
+        time_to_first_trade = (first_trade_time - market_start_time) / 60.0  # minutes
+        
+        # Analyze trade distribution over time (every trade is timed here)
+        minutes_from_start = (timestamp - market_start_time) / 60.0
+        
+        # Trades per minute bucket, counted relative to the earliest bucket
+        time_buckets = {int(b) + first_bucket: int(bucket_counts[b]) for b in np.flatnonzero(bucket_counts)}
+        
+        # Per-trade price points, one array per field
+        price_at_time = {
+            'minutes_from_start': minutes_from_start,
+            'price': price,
+            'outcome_up': columns['outcome_up'],
+            'outcome_down': columns['outcome_down'],
+        }
+        
+        timing = {
+            'time_to_first_trade_minutes': time_to_first_trade,
+            'first_trade_time': _fmt_hms(first_trade_time),
+            'market_start_time': _fmt_hms(market_start_time),
+            'time_buckets': time_buckets,
+            'price_at_time': price_at_time,
+            'total_trades': int(all_sizes.size)
+        }
     
     # Analyze timing patterns
-    timestamps = [t.get('timestamp', 0) for t in trades_sorted if t.get('timestamp', 0)]
-    if timestamps:
-        start_time = datetime.datetime.fromtimestamp(timestamps[0])
-        end_time = datetime.datetime.fromtimestamp(timestamps[-1])
+    if timestamps.size:
+        start_time = _fmt_hms(int(timestamps[0]))
+        end_time = _fmt_hms(int(timestamps[-1]))
         duration_minutes = (timestamps[-1] - timestamps[0]) / 60.0
     else:
         duration_minutes = 0
         start_time = end_time = None
     
-    # Analyze simultaneous trades (same timestamp)
-    timestamp_counts = defaultdict(int)
-    for t in trades_sorted:
-        ts = t.get('timestamp', 0)
-        if ts:
-            timestamp_counts[ts] += 1
-    
-    simultaneous_trades = sum(1 for count in timestamp_counts.values() if count > 1)
-    max_simultaneous = max(timestamp_counts.values()) if timestamp_counts else 0
-    
     # Analyze order distribution
     size_distribution = {
-        'min': min(all_sizes) if all_sizes else 0,
-        'max': max(all_sizes) if all_sizes else 0,
-        'mean': np.mean(all_sizes) if all_sizes else 0,
-        'median': np.median(all_sizes) if all_sizes else 0,
-        'common_sizes': {}
+        'min': size_min,
+        'max': size_max,
+        'mean': size_sum / all_sizes.size,
+        'median': np.median(all_sizes),
+        'common_sizes': _common_sizes(all_sizes)
     }
     
-    # Count common sizes
-    for size in all_sizes:
-        rounded = round(size, 1)
-        size_distribution['common_sizes'][rounded] = size_distribution['common_sizes'].get(rounded, 0) + 1
-    
-    return {
-        'total_trades': len(trades_sorted),
-        'yes_trades': len(yes_trades),
-        'no_trades': len(no_trades),
+    pattern = {
+        'total_trades': int(all_sizes.size),
+        'yes_trades': yes_trades,
+        'no_trades': no_trades,
         'duration_minutes': duration_minutes,
-        'start_time': start_time.strftime('%H:%M:%S') if start_time else None,
-        'end_time': end_time.strftime('%H:%M:%S') if end_time else None,
+        'start_time': start_time,
+        'end_time': end_time,
         'simultaneous_trades': simultaneous_trades,
         'max_simultaneous': max_simultaneous,
         'size_distribution': size_distribution,
-        'yes_avg_price': np.mean(yes_prices) if yes_prices else 0,
-        'no_avg_price': np.mean(no_prices) if no_prices else 0,
-        'yes_price_range': (min(yes_prices), max(yes_prices)) if yes_prices else (0, 0),
-        'no_price_range': (min(no_prices), max(no_prices)) if no_prices else (0, 0),
+        'yes_avg_price': yes_sum / yes_trades if yes_trades else 0,
+        'no_avg_price': no_sum / no_trades if no_trades else 0,
+        'yes_price_range': (yes_min, yes_max) if yes_trades else (0, 0),
+        'no_price_range': (no_min, no_max) if no_trades else (0, 0),
     }
+    
+    return timing, pattern
 
-def compare_markets():
-    """Compare all markets in reports folder"""
+def process_market(market):
+    """Load and analyze one market; top-level so worker processes can run it"""
     
-    # Market data - we need to estimate market start times
-    # 15-minute markets start at :00, :15, :30, :45
-    markets = [
-        {
-            'name': 'BTC_UpDown_9-00-915',
-            'file': 'reports/BTC_UpDown_9-00-915_trades.json',
-            'market_start': '09:00:00',
-            'display_name': '9:00-9:15'
-        },
-        {
-            'name': 'BTC_UpDown_9-15-930',
-            'file': 'reports/BTC_UpDown_9-15-930_trades.json',
-            'market_start': '09:15:00',
-            'display_name': '9:15-9:30'
-        },
-        {
-            'name': 'BTC_UpDown_9-30-945',
-            'file': 'reports/BTC_UpDown_9-30-945_trades.json',
-            'market_start': '09:30:00',
-            'display_name': '9:30-9:45'
-        }
-    ]
+    # Parsed columns are cached next to the JSON (see trades_io)
+    columns = trades_io.load(market['file'])
     
-    results = []
+    # Parse market start time
+    start_parts = market['market_start'].split(':')
+    market_start_dt = datetime.datetime(2025, 12, 12, int(start_parts[0]), int(start_parts[1]), int(start_parts[2]))
+    market_start_ts = market_start_dt.timestamp()
     
-    for market in markets:
-        if not os.path.exists(market['file']):
-            print(f"Warning: {market['file']} not found, skipping...")
+    timing_analysis, pattern_analysis = analyze_market(columns, market_start_ts)
+    
+    return {
+        'name': market['name'],
+        'display_name': market['display_name'],
+        'columns': columns,
+        'timing': timing_analysis,
+        'pattern': pattern_analysis
+    }
+
+def find_markets(reports_dir=REPORTS_DIR):
+    """Find market trade files in reports_dir, ordered by market start
+
+    The market start time comes from the file name; 15-minute markets
+    start at :00, :15, :30, :45.
+    """
+    try:
+        with os.scandir(reports_dir) as entries:
+            matches = [(MARKET_FILE_RE.match(e.name), e.path) for e in entries if e.is_file()]
+    except OSError:
+        return []
+    
+    markets = []
+    for match, path in matches:
+        if match is None:
             continue
-        
-        trades = load_trades(market['file'])
-        
-        # Parse market start time
-        start_parts = market['market_start'].split(':')
-        market_start_dt = datetime.datetime(2025, 12, 12, int(start_parts[0]), int(start_parts[1]), int(start_parts[2]))
-        market_start_ts = market_start_dt.timestamp()
-        
-        timing_analysis = analyze_order_timing(trades, market_start_ts)
-        pattern_analysis = analyze_trading_pattern(trades)
-        
-        results.append({
-            'name': market['name'],
-            'display_name': market['display_name'],
-            'trades': trades,
-            'timing': timing_analysis,
-            'pattern': pattern_analysis
+        name, start_hour, start_minute, end_hour, end_minute = match.groups()
+        markets.append({
+            'name': name,
+            'file': path,
+            'market_start': f"{int(start_hour):02d}:{start_minute}:00",
+            'display_name': f"{int(start_hour)}:{start_minute}-{int(end_hour)}:{end_minute}"
         })
     
-    return results
+    return sorted(markets, key=lambda m: m['market_start'])
+
+def compare_markets():
+    """Compare all markets in reports folder"""
+    
+    found = find_markets()
+    
+    # Markets are independent, so analyze them in parallel worker processes
+    if len(found) < 2:
+        return [process_market(market) for market in found]
+    
+    with ProcessPoolExecutor(max_workers=min(len(found), os.cpu_count() or 1)) as ex:
+        return list(ex.map(process_market, found))
+
+def _comparison_figure():
+    """Return the shared comparison figure, cleared for a new plot"""
+    import matplotlib.pyplot as plt
+    
+    if not _figure:
+        _figure['fig'] = plt.figure(figsize=(18, 14))
+    
+    fig = _figure['fig']
+    fig.clear()
+    return fig
 
 def create_comparison_visualization(results):
     """Create comprehensive comparison visualization"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
     
-    fig = plt.figure(figsize=(18, 14))
+    fig = _comparison_figure()
     gs = fig.add_gridspec(4, 2, hspace=0.4, wspace=0.3)
     
     # 1. Time to first trade
@@ -197,15 +324,15 @@ def create_comparison_visualization(results):
     market_names = [r['display_name'] for r in results]
     time_to_first = [r['timing'].get('time_to_first_trade_minutes', 0) for r in results]
     
-    bars = ax1.bar(market_names, time_to_first, color=['#1f77b4', '#ff7f0e', '#2ca02c'])
+    bars = ax1.bar(market_names, time_to_first, color=MARKET_COLORS)
     ax1.set_ylabel('Minutes from Market Start', fontsize=11)
     ax1.set_title('Time to First Trade (Order Placement Timing)', fontsize=12, fontweight='bold')
     ax1.grid(True, alpha=0.3, axis='y')
     
-    for i, (bar, time) in enumerate(zip(bars, time_to_first)):
+    for i, (bar, minutes) in enumerate(zip(bars, time_to_first)):
         height = bar.get_height()
         ax1.text(bar.get_x() + bar.get_width()/2., height,
-                f'{time:.2f}m', ha='center', va='bottom', fontsize=10, fontweight='bold')
+                f'{minutes:.2f}m', ha='center', va='bottom', fontsize=10, fontweight='bold')
     
     # 2. Trade distribution over time (first 5 minutes)
     ax2 = fig.add_subplot(gs[0, 1])
@@ -213,9 +340,8 @@ def create_comparison_visualization(results):
         time_buckets = result['timing'].get('time_buckets', {})
         minutes = sorted([m for m in time_buckets.keys() if m <= 5])
         counts = [time_buckets.get(m, 0) for m in minutes]
-        colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
         ax2.plot(minutes, counts, marker='o', label=result['display_name'], 
-                color=colors[i], linewidth=2, markersize=6)
+                color=MARKET_COLORS[i % len(MARKET_COLORS)], linewidth=2, markersize=6)
     
     ax2.set_xlabel('Minutes from Market Start', fontsize=11)
     ax2.set_ylabel('Number of Trades', fontsize=11)
@@ -241,11 +367,12 @@ def create_comparison_visualization(results):
     
     # 4. Trade size distribution
     ax4 = fig.add_subplot(gs[1, 1])
+    # One set of bin edges for all markets so the histograms line up
+    bin_edges = np.histogram_bin_edges(np.concatenate([r['columns']['size'] for r in results]), bins=30)
     for i, result in enumerate(results):
-        sizes = [float(t.get('size', 0)) for t in result['trades']]
-        colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
-        ax4.hist(sizes, bins=30, alpha=0.5, label=result['display_name'], 
-                color=colors[i], edgecolor='black')
+        sizes = result['columns']['size']
+        ax4.hist(sizes, bins=bin_edges, alpha=0.5, label=result['display_name'], 
+                color=MARKET_COLORS[i % len(MARKET_COLORS)], edgecolor='black', rasterized=True)
     
     ax4.set_xlabel('Trade Size (Shares)', fontsize=11)
     ax4.set_ylabel('Frequency', fontsize=11)
@@ -256,22 +383,22 @@ def create_comparison_visualization(results):
     # 5. Price movement over time (first trade to last)
     ax5 = fig.add_subplot(gs[2, :])
     for i, result in enumerate(results):
-        price_data = result['timing'].get('price_at_time', [])
+        price_data = result['timing'].get('price_at_time')
         if price_data:
-            yes_data = [p for p in price_data if p['side'] == 'up']
-            no_data = [p for p in price_data if p['side'] == 'down']
+            minutes = price_data['minutes_from_start']
+            prices = price_data['price']
+            yes_mask = price_data['outcome_up']
+            no_mask = price_data['outcome_down']
             
-            colors = ['#1f77b4', '#ff7f0e', '#2ca02c']
-            if yes_data:
-                yes_times = [p['minutes_from_start'] for p in yes_data]
-                yes_prices = [p['price'] for p in yes_data]
-                ax5.scatter(yes_times, yes_prices, alpha=0.4, s=20, 
-                          color=colors[i], marker='^', label=f"{result['display_name']} YES")
-            if no_data:
-                no_times = [p['minutes_from_start'] for p in no_data]
-                no_prices = [p['price'] for p in no_data]
-                ax5.scatter(no_times, no_prices, alpha=0.4, s=20,
-                          color=colors[i], marker='v', label=f"{result['display_name']} NO")
+            color = MARKET_COLORS[i % len(MARKET_COLORS)]
+            if yes_mask.any():
+                ax5.scatter(minutes[yes_mask], prices[yes_mask], alpha=0.4, s=20, 
+                          color=color, marker='^', label=f"{result['display_name']} YES",
+                          rasterized=True)
+            if no_mask.any():
+                ax5.scatter(minutes[no_mask], prices[no_mask], alpha=0.4, s=20,
+                          color=color, marker='v', label=f"{result['display_name']} NO",
+                          rasterized=True)
     
     ax5.set_xlabel('Minutes from Market Start', fontsize=11)
     ax5.set_ylabel('Price ($)', fontsize=11)
@@ -335,99 +462,104 @@ def create_comparison_visualization(results):
             fontsize=9, va='top', ha='left', family='monospace',
             bbox=dict(boxstyle='round,pad=1', facecolor='lightblue', alpha=0.8))
     
-    plt.suptitle('Trading Strategy Comparison Across Markets', fontsize=16, fontweight='bold', y=0.995)
-    plt.savefig('reports/strategy_comparison.png', dpi=200, bbox_inches='tight')
+    fig.suptitle('Trading Strategy Comparison Across Markets', fontsize=16, fontweight='bold', y=0.995)
+    with plt.rc_context(PNG_RC):
+        fig.savefig('reports/strategy_comparison.png', dpi=120, bbox_inches='tight')
     print("Strategy comparison saved as 'reports/strategy_comparison.png'")
-    plt.close()
 
 def print_detailed_analysis(results):
     """Print detailed analysis to console"""
-    print("\n" + "="*80)
-    print("DETAILED STRATEGY ANALYSIS")
-    print("="*80)
+    out = []
+    w = out.append
+    
+    w("\n" + "="*80)
+    w("DETAILED STRATEGY ANALYSIS")
+    w("="*80)
     
     for result in results:
-        print(f"\n{result['display_name']} Market:")
-        print("-" * 60)
+        w(f"\n{result['display_name']} Market:")
+        w("-" * 60)
         
         timing = result['timing']
         pattern = result['pattern']
         
-        print(f"\nOrder Placement Timing:")
-        print(f"  Market started: {timing.get('market_start_time', 'N/A')}")
-        print(f"  First trade: {timing.get('first_trade_time', 'N/A')}")
-        print(f"  Time to first trade: {timing.get('time_to_first_trade_minutes', 0):.2f} minutes")
+        w(f"\nOrder Placement Timing:")
+        w(f"  Market started: {timing.get('market_start_time', 'N/A')}")
+        w(f"  First trade: {timing.get('first_trade_time', 'N/A')}")
+        w(f"  Time to first trade: {timing.get('time_to_first_trade_minutes', 0):.2f} minutes")
         
         if timing.get('time_to_first_trade_minutes', 0) < 0.5:
-            print("  [IMMEDIATE] STRATEGY: Orders placed IMMEDIATELY at market start")
+            w("  [IMMEDIATE] STRATEGY: Orders placed IMMEDIATELY at market start")
         elif timing.get('time_to_first_trade_minutes', 0) < 2:
-            print("  [QUICK] STRATEGY: Orders placed VERY QUICKLY after market start")
+            w("  [QUICK] STRATEGY: Orders placed VERY QUICKLY after market start")
         else:
-            print("  [DELAYED] STRATEGY: Orders placed after market has been active")
+            w("  [DELAYED] STRATEGY: Orders placed after market has been active")
         
-        print(f"\nTrading Pattern:")
-        print(f"  Total trades: {pattern.get('total_trades', 0)}")
-        print(f"  YES trades: {pattern.get('yes_trades', 0)}")
-        print(f"  NO trades: {pattern.get('no_trades', 0)}")
-        print(f"  Trading duration: {pattern.get('duration_minutes', 0):.1f} minutes")
-        print(f"  Trades per minute: {pattern.get('total_trades', 0) / max(pattern.get('duration_minutes', 1), 1):.1f}")
+        w(f"\nTrading Pattern:")
+        w(f"  Total trades: {pattern.get('total_trades', 0)}")
+        w(f"  YES trades: {pattern.get('yes_trades', 0)}")
+        w(f"  NO trades: {pattern.get('no_trades', 0)}")
+        w(f"  Trading duration: {pattern.get('duration_minutes', 0):.1f} minutes")
+        w(f"  Trades per minute: {pattern.get('total_trades', 0) / max(pattern.get('duration_minutes', 1), 1):.1f}")
         
-        print(f"\nExecution Style:")
-        print(f"  Simultaneous trades: {pattern.get('simultaneous_trades', 0)}")
-        print(f"  Max simultaneous: {pattern.get('max_simultaneous', 0)}")
+        w(f"\nExecution Style:")
+        w(f"  Simultaneous trades: {pattern.get('simultaneous_trades', 0)}")
+        w(f"  Max simultaneous: {pattern.get('max_simultaneous', 0)}")
         if pattern.get('max_simultaneous', 0) > 5:
-            print("  [PARALLEL] STRATEGY: Heavy use of parallel order execution")
+            w("  [PARALLEL] STRATEGY: Heavy use of parallel order execution")
         else:
-            print("  [SEQUENTIAL] STRATEGY: More sequential order execution")
+            w("  [SEQUENTIAL] STRATEGY: More sequential order execution")
         
-        print(f"\nTrade Sizing:")
+        w(f"\nTrade Sizing:")
         size_dist = pattern.get('size_distribution', {})
-        print(f"  Min size: {size_dist.get('min', 0):.2f} shares")
-        print(f"  Max size: {size_dist.get('max', 0):.2f} shares")
-        print(f"  Avg size: {size_dist.get('mean', 0):.2f} shares")
-        print(f"  Median size: {size_dist.get('median', 0):.2f} shares")
+        w(f"  Min size: {size_dist.get('min', 0):.2f} shares")
+        w(f"  Max size: {size_dist.get('max', 0):.2f} shares")
+        w(f"  Avg size: {size_dist.get('mean', 0):.2f} shares")
+        w(f"  Median size: {size_dist.get('median', 0):.2f} shares")
         
         # Most common sizes
         common_sizes = sorted(size_dist.get('common_sizes', {}).items(), 
                             key=lambda x: x[1], reverse=True)[:3]
         if common_sizes:
-            print(f"  Most common sizes: {', '.join([f'{s:.1f}sh ({c}x)' for s, c in common_sizes])}")
+            w(f"  Most common sizes: {', '.join([f'{s:.1f}sh ({c}x)' for s, c in common_sizes])}")
         
-        print(f"\nPrice Characteristics:")
-        print(f"  YES avg price: ${pattern.get('yes_avg_price', 0):.4f}")
-        print(f"  NO avg price: ${pattern.get('no_avg_price', 0):.4f}")
+        w(f"\nPrice Characteristics:")
+        w(f"  YES avg price: ${pattern.get('yes_avg_price', 0):.4f}")
+        w(f"  NO avg price: ${pattern.get('no_avg_price', 0):.4f}")
         yes_range = pattern.get('yes_price_range', (0, 0))
         no_range = pattern.get('no_price_range', (0, 0))
-        print(f"  YES price range: ${yes_range[0]:.4f} - ${yes_range[1]:.4f}")
-        print(f"  NO price range: ${no_range[0]:.4f} - ${no_range[1]:.4f}")
+        w(f"  YES price range: ${yes_range[0]:.4f} - ${yes_range[1]:.4f}")
+        w(f"  NO price range: ${no_range[0]:.4f} - ${no_range[1]:.4f}")
     
-    print("\n" + "="*80)
-    print("KEY INSIGHTS:")
-    print("="*80)
+    w("\n" + "="*80)
+    w("KEY INSIGHTS:")
+    w("="*80)
     
     # Compare timing
     timings = [r['timing'].get('time_to_first_trade_minutes', 0) for r in results]
     if all(t < 1 for t in timings):
-        print("[IMMEDIATE] Orders are placed IMMEDIATELY when markets open")
-        print("  -> Strategy: Bot is ready and waiting for market start")
+        w("[IMMEDIATE] Orders are placed IMMEDIATELY when markets open")
+        w("  -> Strategy: Bot is ready and waiting for market start")
     elif all(t < 2 for t in timings):
-        print("[QUICK] Orders are placed VERY QUICKLY after market start")
-        print("  -> Strategy: Bot reacts to market opening within seconds")
+        w("[QUICK] Orders are placed VERY QUICKLY after market start")
+        w("  -> Strategy: Bot reacts to market opening within seconds")
     else:
-        print("[DELAYED] Orders are placed after some delay")
-        print("  -> Strategy: Bot may wait for initial price discovery")
+        w("[DELAYED] Orders are placed after some delay")
+        w("  -> Strategy: Bot may wait for initial price discovery")
     
     # Compare simultaneous trades
     max_sims = [r['pattern'].get('max_simultaneous', 0) for r in results]
     if all(m > 5 for m in max_sims):
-        print("\n[PARALLEL] Heavy use of parallel order execution")
-        print("  -> Strategy: Bot places multiple orders simultaneously")
-        print("  -> Likely using asyncio.gather() or similar parallel execution")
+        w("\n[PARALLEL] Heavy use of parallel order execution")
+        w("  -> Strategy: Bot places multiple orders simultaneously")
+        w("  -> Likely using asyncio.gather() or similar parallel execution")
     else:
-        print("\n[SEQUENTIAL] More sequential order execution")
-        print("  -> Strategy: Bot places orders one at a time or in smaller batches")
+        w("\n[SEQUENTIAL] More sequential order execution")
+        w("  -> Strategy: Bot places orders one at a time or in smaller batches")
+    
+    w("\n" + "="*80)
     
-    print("\n" + "="*80)
+    sys.stdout.write('\n'.join(out) + '\n')
 
 def main():
     results = compare_markets()
@@ -3,100 +3,169 @@
 Enhanced detailed trade analysis with visualizations
 """
 
-import json
 import datetime
-from collections import defaultdict
-from statistics import mean, median, stdev
+import os
 import matplotlib.pyplot as plt
 import numpy as np
 import matplotlib.dates as mdates
 from matplotlib.patches import Rectangle
 import sys
 
-def load_trades(filename="trades.json"):
-    """Load trades from JSON file"""
-    with open(filename, 'r', encoding='utf-8') as f:
-        return json.load(f)
+import trades_io
 
-def analyze_trades_detailed(trades, report_name=None):
-    """Perform detailed analysis with visualizations"""
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Agg draws long polylines (combined price, arbitrage) in chunks of this size
+PNG_RC = {'agg.path.chunksize': 10000}
+
+def _position_scan_numpy(prices, sizes, is_up, is_down, timed):
+    """Cumulative positions and combined price for the timed trades (NumPy)"""
+    
+    # Latest YES/NO price as of each trade (untimed trades included); until
+    # the other side has traded, a trade's own price stands in for it
+    other_side = np.where(is_up, trades_io.forward_fill(prices, is_down), trades_io.forward_fill(prices, is_up))
+    other_side = np.where(np.isnan(other_side), prices, other_side)
+    
+    timed_prices = prices[timed]
+    timed_sizes = sizes[timed]
+    timed_is_up = is_up[timed]
+    timed_costs = timed_prices * timed_sizes
+    
+    # Anything not YES counts as NO
+    yes_shares = np.cumsum(np.where(timed_is_up, timed_sizes, 0.0))
+    no_shares = np.cumsum(np.where(timed_is_up, 0.0, timed_sizes))
+    yes_cost = np.cumsum(np.where(timed_is_up, timed_costs, 0.0))
+    no_cost = np.cumsum(np.where(timed_is_up, 0.0, timed_costs))
+    combined_price = timed_prices + other_side[timed]
+    
+    return yes_shares, no_shares, yes_cost, no_cost, combined_price
+
+def _position_scan_loop(prices, sizes, is_up, is_down, timed):
+    """Walk the sorted trades once, tracking positions and latest prices
+
+    Returns (yes_shares, no_shares, yes_cost, no_cost, combined_price) for
+    the timed trades. Untimed trades only update the latest YES/NO price.
+    """
+    n_timed = 0
+    for i in range(timed.shape[0]):
+        if timed[i]:
+            n_timed += 1
+    yes_shares = np.empty(n_timed)
+    no_shares = np.empty(n_timed)
+    yes_cost = np.empty(n_timed)
+    no_cost = np.empty(n_timed)
+    combined_price = np.empty(n_timed)
+    
+    cumulative_yes = 0.0
+    cumulative_no = 0.0
+    cumulative_yes_cost = 0.0
+    cumulative_no_cost = 0.0
+    latest_up = np.nan
+    latest_down = np.nan
+    # i is the trade's position in sorted order and j its slot among the
+    # timed trades; carry both rather than looking a trade up by value
+    # (list.index inside this loop was what made it quadratic)
+    j = 0
+    for i in range(prices.shape[0]):
+        price = prices[i]
+        if timed[i]:
+            cost = price * sizes[i]
+            if is_up[i]:
+                cumulative_yes += sizes[i]
+                cumulative_yes_cost += cost
+                other = latest_down
+            else:
+                cumulative_no += sizes[i]
+                cumulative_no_cost += cost
+                other = latest_up
+            if np.isnan(other):
+                other = price
+            yes_shares[j] = cumulative_yes
+            no_shares[j] = cumulative_no
+            yes_cost[j] = cumulative_yes_cost
+            no_cost[j] = cumulative_no_cost
+            combined_price[j] = price + other
+            j += 1
+        
+        if is_up[i]:
+            latest_up = price
+        elif is_down[i]:
+            latest_down = price
+    
+    return yes_shares, no_shares, yes_cost, no_cost, combined_price
+
+if njit is not None:
+    _position_scan = njit('UniTuple(float64[:], 5)(float64[:], float64[:], boolean[:], boolean[:], boolean[:])',
+                          cache=True)(_position_scan_loop)
+else:
+    _position_scan = _position_scan_numpy
+
+def _fmt_time_axis(ax):
+    """Label a time x-axis as HH:MM:SS with rotated tick labels"""
     
-    if not trades:
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
+    plt.setp(ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
+
+def analyze_trades_detailed(data, report_name=None):
+    """Perform detailed analysis with visualizations on trades_io.load() data"""
+    
+    if not data['timestamp'].size:
         print("No trades to analyze.")
         return
     
     # Set output file paths
     if report_name:
-        import os
         os.makedirs("reports", exist_ok=True)
         output_file = os.path.join("reports", f"{report_name}_detailed_analysis.png")
     else:
         output_file = "detailed_trade_analysis.png"
     
-    # Sort by timestamp
-    trades_sorted = sorted(trades, key=lambda x: x.get('timestamp', 0))
+    # Columns come sorted by timestamp, equal timestamps in file order
+    trade_ts = data['timestamp']
+    trade_prices = data['price']
+    trade_sizes = data['size']
+    trade_is_up = data['outcome_up']
+    trade_is_down = data['outcome_down']
+    trade_is_buy = data['side_buy']
     
     # Separate trades
-    buy_up = [t for t in trades_sorted if t.get('side', '').upper() == 'BUY' and t.get('outcome', '').lower() == 'up']
-    buy_down = [t for t in trades_sorted if t.get('side', '').upper() == 'BUY' and t.get('outcome', '').lower() == 'down']
-    
-    # Calculate cumulative positions
-    yes_shares = []
-    no_shares = []
-    yes_cost = []
-    no_cost = []
-    combined_price = []
-    timestamps = []
-    cumulative_yes = 0
-    cumulative_no = 0
-    cumulative_yes_cost = 0
-    cumulative_no_cost = 0
-    
-    for t in trades_sorted:
-        ts = t.get('timestamp', 0)
-        if ts:
-            timestamps.append(datetime.datetime.fromtimestamp(ts))
-            price = float(t.get('price', 0))
-            size = float(t.get('size', 0))
-            cost = price * size
-            
-            if t.get('outcome', '').lower() == 'up':
-                cumulative_yes += size
-                cumulative_yes_cost += cost
-            else:
-                cumulative_no += size
-                cumulative_no_cost += cost
-            
-            yes_shares.append(cumulative_yes)
-            no_shares.append(cumulative_no)
-            yes_cost.append(cumulative_yes_cost)
-            no_cost.append(cumulative_no_cost)
-            
-            # Get current prices for combined calculation
-            if t.get('outcome', '').lower() == 'up':
-                # Find latest down price
-                latest_down_price = price
-                for t2 in reversed(trades_sorted[:trades_sorted.index(t)+1]):
-                    if t2.get('outcome', '').lower() == 'down':
-                        latest_down_price = float(t2.get('price', 0))
-                        break
-                combined_price.append(price + latest_down_price)
-            else:
-                # Find latest up price
-                latest_up_price = price
-                for t2 in reversed(trades_sorted[:trades_sorted.index(t)+1]):
-                    if t2.get('outcome', '').lower() == 'up':
-                        latest_up_price = float(t2.get('price', 0))
-                        break
-                combined_price.append(latest_up_price + price)
-    
-    # Calculate arbitrage opportunities
-    arb_opportunities = []
-    for cp in combined_price:
-        if cp < 1.0:
-            arb_opportunities.append(1.0 - cp)
-        else:
-            arb_opportunities.append(0)
+    buy_up = trade_is_buy & trade_is_up
+    buy_down = trade_is_buy & trade_is_down
+    
+    # The rest of the analysis covers the trades that have a timestamp
+    timed = trade_ts != 0
+    # Local datetimes for every trade, converting each distinct timestamp once
+    unique_ts, ts_index = np.unique(trade_ts, return_inverse=True)
+    unique_times = np.empty(unique_ts.size, dtype=object)
+    unique_times[:] = [datetime.datetime.fromtimestamp(ts) for ts in unique_ts.tolist()]
+    trade_times = unique_times[ts_index]
+    timestamps = trade_times[timed]
+    
+    # YES/NO buy prices and times, gathered with the buy masks
+    up_prices = trade_prices[buy_up]
+    up_times = trade_times[buy_up]
+    down_prices = trade_prices[buy_down]
+    down_times = trade_times[buy_down]
+    
+    # Cumulative positions and the combined YES+NO price, then the
+    # arbitrage below $1.00
+    yes_shares, no_shares, yes_cost, no_cost, combined_price = _position_scan(
+        trade_prices, trade_sizes, trade_is_up, trade_is_down, timed)
+    arb_opportunities = np.maximum(1.0 - combined_price, 0.0)
+    total_cost = yes_cost + no_cost
+    
+    # Summary metrics, read once off the cumulative columns; 1 - x is
+    # monotone, so the largest arbitrage follows from the lowest price
+    final_yes_shares = yes_shares[-1] if yes_shares.size else 0
+    final_no_shares = no_shares[-1] if no_shares.size else 0
+    final_total_cost = total_cost[-1] if total_cost.size else 0
+    avg_combined = combined_price.mean() if combined_price.size else 0
+    min_combined = combined_price.min() if combined_price.size else 0
+    max_arb = max(1.0 - min_combined, 0.0) if combined_price.size else 0
+    arb_trades = np.count_nonzero(combined_price < 1.0)
     
     # Create comprehensive visualization
     fig = plt.figure(figsize=(18, 14))
@@ -105,20 +174,15 @@ def analyze_trades_detailed(trades, report_name=None):
     # 1. Price movement over time
     ax1 = fig.add_subplot(gs[0, :])
     
-    up_prices = [float(t.get('price', 0)) for t in buy_up]
-    up_times = [datetime.datetime.fromtimestamp(t.get('timestamp', 0)) for t in buy_up]
-    down_prices = [float(t.get('price', 0)) for t in buy_down]
-    down_times = [datetime.datetime.fromtimestamp(t.get('timestamp', 0)) for t in buy_down]
-    
-    ax1.scatter(up_times, up_prices, color='green', alpha=0.6, s=30, label='YES (Up) Price', marker='^')
-    ax1.scatter(down_times, down_prices, color='red', alpha=0.6, s=30, label='NO (Down) Price', marker='v')
+    ax1.scatter(up_times, up_prices, color='green', alpha=0.6, s=30, label='YES (Up) Price', marker='^', rasterized=True)
+    ax1.scatter(down_times, down_prices, color='red', alpha=0.6, s=30, label='NO (Down) Price', marker='v', rasterized=True)
     
     # Add combined price line
     ax1_twin = ax1.twinx()
     ax1_twin.plot(timestamps, combined_price, color='blue', linewidth=2, alpha=0.7, label='Combined Price')
     ax1_twin.axhline(y=1.0, color='black', linestyle='--', linewidth=1, alpha=0.5, label='Parity ($1.00)')
-    ax1_twin.fill_between(timestamps, combined_price, 1.0, where=[cp < 1.0 for cp in combined_price], 
-                          color='green', alpha=0.2, label='Arbitrage Zone')
+    ax1_twin.fill_between(timestamps, combined_price, 1.0, where=combined_price < 1.0, 
+                          color='green', alpha=0.2, label='Arbitrage Zone', rasterized=True)
     ax1_twin.set_ylabel('Combined Price ($)', color='blue', fontsize=10)
     ax1_twin.tick_params(axis='y', labelcolor='blue')
     ax1_twin.set_ylim(0.85, 1.05)
@@ -130,68 +194,63 @@ def analyze_trades_detailed(trades, report_name=None):
     ax1.legend(loc='upper left')
     ax1.grid(True, alpha=0.3)
     ax1.set_ylim(0, 1.0)
-    ax1.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
     ax1.xaxis.set_major_locator(mdates.MinuteLocator(interval=1))
-    plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
     
     # 2. Cumulative shares position
     ax2 = fig.add_subplot(gs[1, 0])
     ax2.plot(timestamps, yes_shares, color='green', linewidth=2, label='YES Shares', marker='o', markersize=3)
     ax2.plot(timestamps, no_shares, color='red', linewidth=2, label='NO Shares', marker='s', markersize=3)
-    ax2.fill_between(timestamps, yes_shares, alpha=0.3, color='green')
-    ax2.fill_between(timestamps, no_shares, alpha=0.3, color='red')
+    ax2.fill_between(timestamps, yes_shares, alpha=0.3, color='green', rasterized=True)
+    ax2.fill_between(timestamps, no_shares, alpha=0.3, color='red', rasterized=True)
     ax2.set_xlabel('Time', fontsize=10)
     ax2.set_ylabel('Cumulative Shares', fontsize=10)
     ax2.set_title('Cumulative Position (Shares)', fontsize=12, fontweight='bold')
     ax2.legend()
     ax2.grid(True, alpha=0.3)
-    ax2.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-    plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
     
     # 3. Cumulative cost
     ax3 = fig.add_subplot(gs[1, 1])
     ax3.plot(timestamps, yes_cost, color='green', linewidth=2, label='YES Cost', marker='o', markersize=3)
     ax3.plot(timestamps, no_cost, color='red', linewidth=2, label='NO Cost', marker='s', markersize=3)
-    total_cost = [y + n for y, n in zip(yes_cost, no_cost)]
     ax3.plot(timestamps, total_cost, color='blue', linewidth=2.5, linestyle='--', label='Total Cost', alpha=0.8)
-    ax3.fill_between(timestamps, yes_cost, alpha=0.3, color='green')
-    ax3.fill_between(timestamps, no_cost, alpha=0.3, color='red')
+    ax3.fill_between(timestamps, yes_cost, alpha=0.3, color='green', rasterized=True)
+    ax3.fill_between(timestamps, no_cost, alpha=0.3, color='red', rasterized=True)
     ax3.set_xlabel('Time', fontsize=10)
     ax3.set_ylabel('Cumulative Cost ($)', fontsize=10)
     ax3.set_title('Cumulative Cost Over Time', fontsize=12, fontweight='bold')
     ax3.legend()
     ax3.grid(True, alpha=0.3)
-    ax3.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-    plt.setp(ax3.xaxis.get_majorticklabels(), rotation=45, ha='right')
     
     # 4. Arbitrage opportunity over time
     ax4 = fig.add_subplot(gs[2, 0])
     ax4.plot(timestamps, arb_opportunities, color='purple', linewidth=2, marker='o', markersize=2)
-    ax4.fill_between(timestamps, arb_opportunities, alpha=0.4, color='purple')
+    ax4.fill_between(timestamps, arb_opportunities, alpha=0.4, color='purple', rasterized=True)
     ax4.set_xlabel('Time', fontsize=10)
     ax4.set_ylabel('Arbitrage Opportunity ($)', fontsize=10)
     ax4.set_title('Arbitrage Opportunity Over Time', fontsize=12, fontweight='bold')
     ax4.grid(True, alpha=0.3)
-    ax4.xaxis.set_major_formatter(mdates.DateFormatter('%H:%M:%S'))
-    plt.setp(ax4.xaxis.get_majorticklabels(), rotation=45, ha='right')
     
     # Add text annotation for max arb opportunity
-    if arb_opportunities:
+    if max_arb > 0:
         max_arb_idx = np.argmax(arb_opportunities)
-        max_arb_val = arb_opportunities[max_arb_idx]
-        if max_arb_val > 0:
-            ax4.annotate(f'Max: ${max_arb_val:.4f}', 
-                        xy=(timestamps[max_arb_idx], max_arb_val),
-                        xytext=(10, 10), textcoords='offset points',
-                        bbox=dict(boxstyle='round,pad=0.5', facecolor='yellow', alpha=0.7),
-                        arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
+        ax4.annotate(f'Max: ${max_arb:.4f}', 
+                    xy=(timestamps[max_arb_idx], max_arb),
+                    xytext=(10, 10), textcoords='offset points',
+                    bbox=dict(boxstyle='round,pad=0.5', facecolor='yellow', alpha=0.7),
+                    arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
+    
+    for ax in (ax1, ax2, ax3, ax4):
+        _fmt_time_axis(ax)
     
     # 5. Trade size distribution
     ax5 = fig.add_subplot(gs[2, 1])
-    all_sizes = [float(t.get('size', 0)) for t in trades_sorted]
-    ax5.hist(all_sizes, bins=30, color='steelblue', alpha=0.7, edgecolor='black')
-    ax5.axvline(mean(all_sizes), color='red', linestyle='--', linewidth=2, label=f'Mean: {mean(all_sizes):.2f}')
-    ax5.axvline(median(all_sizes), color='green', linestyle='--', linewidth=2, label=f'Median: {median(all_sizes):.2f}')
+    size_mean = trade_sizes.mean()
+    size_median = np.median(trade_sizes)
+    size_counts, size_edges = np.histogram(trade_sizes, bins=30)
+    ax5.bar(size_edges[:-1], size_counts, width=np.diff(size_edges), align='edge',
+            color='steelblue', alpha=0.7, edgecolor='black')
+    ax5.axvline(size_mean, color='red', linestyle='--', linewidth=2, label=f'Mean: {size_mean:.2f}')
+    ax5.axvline(size_median, color='green', linestyle='--', linewidth=2, label=f'Median: {size_median:.2f}')
     ax5.set_xlabel('Trade Size (Shares)', fontsize=10)
     ax5.set_ylabel('Frequency', fontsize=10)
     ax5.set_title('Trade Size Distribution', fontsize=12, fontweight='bold')
@@ -200,8 +259,13 @@ def analyze_trades_detailed(trades, report_name=None):
     
     # 6. Price distribution
     ax6 = fig.add_subplot(gs[3, 0])
-    ax6.hist(up_prices, bins=30, color='green', alpha=0.6, label='YES Prices', edgecolor='black')
-    ax6.hist(down_prices, bins=30, color='red', alpha=0.6, label='NO Prices', edgecolor='black')
+    # One set of bin edges for both sides so the bars line up
+    price_edges = np.histogram_bin_edges(np.concatenate([up_prices, down_prices]), bins=30)
+    price_widths = np.diff(price_edges)
+    ax6.bar(price_edges[:-1], np.histogram(up_prices, bins=price_edges)[0], width=price_widths, align='edge',
+            color='green', alpha=0.6, label='YES Prices', edgecolor='black')
+    ax6.bar(price_edges[:-1], np.histogram(down_prices, bins=price_edges)[0], width=price_widths, align='edge',
+            color='red', alpha=0.6, label='NO Prices', edgecolor='black')
     ax6.set_xlabel('Price ($)', fontsize=10)
     ax6.set_ylabel('Frequency', fontsize=10)
     ax6.set_title('Price Distribution', fontsize=12, fontweight='bold')
@@ -210,17 +274,14 @@ def analyze_trades_detailed(trades, report_name=None):
     
     # 7. Trading velocity (trades per minute)
     ax7 = fig.add_subplot(gs[3, 1])
-    trades_by_minute = defaultdict(list)
-    for t in trades_sorted:
-        ts = t.get('timestamp', 0)
-        if ts:
-            dt = datetime.datetime.fromtimestamp(ts)
-            minute_key = dt.replace(second=0, microsecond=0)
-            trades_by_minute[minute_key].append(t)
-    
-    minutes = sorted(trades_by_minute.keys())
-    trade_counts = [len(trades_by_minute[m]) for m in minutes]
-    minute_labels = [m.strftime('%H:%M') for m in minutes]
+    # Count trades per whole minute of epoch time (local minutes start on
+    # the same boundaries) and label only the minutes that had trades
+    minute_ids = trade_ts[timed] // 60
+    first_minute = int(minute_ids[0]) if minute_ids.size else 0
+    minute_counts = np.bincount(minute_ids - first_minute)
+    minutes = (np.flatnonzero(minute_counts) + first_minute).tolist()
+    trade_counts = minute_counts[minute_counts > 0]
+    minute_labels = [datetime.datetime.fromtimestamp(m * 60).strftime('%H:%M') for m in minutes]
     
     bars = ax7.bar(range(len(minutes)), trade_counts, color='orange', alpha=0.7, edgecolor='black')
     ax7.set_xlabel('Minute', fontsize=10)
@@ -240,24 +301,14 @@ def analyze_trades_detailed(trades, report_name=None):
     ax8 = fig.add_subplot(gs[4, :])
     ax8.axis('off')
     
-    # Calculate final metrics
-    final_yes_shares = yes_shares[-1] if yes_shares else 0
-    final_no_shares = no_shares[-1] if no_shares else 0
-    final_total_cost = total_cost[-1] if total_cost else 0
-    
     # Market resolved to NO (Down), so NO shares worth $1 each
     final_value = final_no_shares * 1.0  # NO shares are worth $1
     pnl = final_value - final_total_cost
     
-    # Calculate average combined price
-    avg_combined = mean(combined_price) if combined_price else 0
-    min_combined = min(combined_price) if combined_price else 0
-    max_arb = max(arb_opportunities) if arb_opportunities else 0
-    
     summary_text = f"""
     PERFORMANCE SUMMARY
     {'='*80}
-    Total Trades: {len(trades_sorted)} | Total Cost: ${final_total_cost:.2f} | Final Value: ${final_value:.2f}
+    Total Trades: {trade_ts.size} | Total Cost: ${final_total_cost:.2f} | Final Value: ${final_value:.2f}
     Net PnL: ${pnl:.2f} ({pnl/final_total_cost*100:.2f}%) | Final YES Shares: {final_yes_shares:.2f} | Final NO Shares: {final_no_shares:.2f}
     Average Combined Price: ${avg_combined:.4f} | Min Combined Price: ${min_combined:.4f} | Max Arbitrage Opportunity: ${max_arb:.4f}
     """
@@ -267,10 +318,11 @@ def analyze_trades_detailed(trades, report_name=None):
             bbox=dict(boxstyle='round,pad=1', facecolor='lightblue', alpha=0.8),
             family='monospace')
     
-    plt.suptitle(f'Trade Analysis: {trades[0].get("title", "Unknown Market")}', 
+    plt.suptitle(f'Trade Analysis: {data["title"]}', 
                 fontsize=16, fontweight='bold', y=0.995)
     
-    plt.savefig(output_file, dpi=200, bbox_inches='tight')
+    with plt.rc_context(PNG_RC):
+        plt.savefig(output_file, dpi=200, bbox_inches='tight')
     print(f"Detailed analysis chart saved as '{output_file}'")
     plt.close()
     
@@ -290,18 +342,18 @@ def analyze_trades_detailed(trades, report_name=None):
     print(f"  Average Combined Price: ${avg_combined:.4f}")
     print(f"  Minimum Combined Price: ${min_combined:.4f}")
     print(f"  Maximum Arbitrage Opportunity: ${max_arb:.4f} ({max_arb/min_combined*100:.2f}%)")
-    print(f"  Trades with Arbitrage Opportunity: {sum(1 for a in arb_opportunities if a > 0)}/{len(arb_opportunities)}")
+    print(f"  Trades with Arbitrage Opportunity: {arb_trades}/{arb_opportunities.size}")
     
     print(f"\nTrading Patterns:")
-    print(f"  Peak Trading Minute: {minute_labels[np.argmax(trade_counts)]} ({max(trade_counts)} trades)")
-    print(f"  Average Trades per Minute: {mean(trade_counts):.1f}")
+    print(f"  Peak Trading Minute: {minute_labels[np.argmax(trade_counts)]} ({trade_counts.max()} trades)")
+    print(f"  Average Trades per Minute: {trade_counts.mean():.1f}")
     print(f"  Total Trading Duration: {(timestamps[-1] - timestamps[0]).total_seconds()/60:.1f} minutes")
     
     print(f"\nPrice Statistics:")
-    print(f"  YES Price Range: ${min(up_prices):.4f} - ${max(up_prices):.4f}")
-    print(f"  NO Price Range:  ${min(down_prices):.4f} - ${max(down_prices):.4f}")
-    print(f"  YES Avg Price: ${mean(up_prices):.4f}")
-    print(f"  NO Avg Price:  ${mean(down_prices):.4f}")
+    print(f"  YES Price Range: ${up_prices.min():.4f} - ${up_prices.max():.4f}")
+    print(f"  NO Price Range:  ${down_prices.min():.4f} - ${down_prices.max():.4f}")
+    print(f"  YES Avg Price: ${up_prices.mean():.4f}")
+    print(f"  NO Avg Price:  ${down_prices.mean():.4f}")
     
     print("\n" + "="*80)
 
@@ -310,11 +362,11 @@ def main():
     report_name = sys.argv[2] if len(sys.argv) > 2 else None
     
     try:
-        trades = load_trades(filename)
-        analyze_trades_detailed(trades, report_name)
+        data = trades_io.load(filename)
+        analyze_trades_detailed(data, report_name)
     except FileNotFoundError:
         print(f"Error: File '{filename}' not found.")
-    except json.JSONDecodeError:
+    except trades_io.JSON_ERRORS:
         print(f"Error: File '{filename}' is not valid JSON.")
     except Exception as e:
         print(f"Error: {e}")
@@ -9,221 +9,96 @@ import sqlite3
 import os
 import json
 from datetime import datetime, timedelta
-from flask import Flask, render_template_string, jsonify
+from flask import Flask, Response, g, has_app_context, request
+from markupsafe import Markup
 try:
     from flask_cors import CORS
     CORS_AVAILABLE = True
 except ImportError:
     CORS_AVAILABLE = False
+try:
+    from flask_compress import Compress
+    COMPRESS_AVAILABLE = True
+except ImportError:
+    COMPRESS_AVAILABLE = False
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
+import atexit
+import hashlib
+import math
+import queue
 import threading
 import time
 
 app = Flask(__name__)
+# static/dashboard.css rarely changes, so browsers keep it for a day
+app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 86400
 if CORS_AVAILABLE:
     CORS(app)
+if COMPRESS_AVAILABLE:
+    Compress(app)
 
 DB_PATH = 'gabagool_ultra.db'
 STATE_FILE = 'gabagool_state.json'
 
+# Per-connection settings; the dashboard only ever reads the bot's database
+DB_PRAGMAS = '''
+    PRAGMA temp_store=MEMORY;
+    PRAGMA mmap_size=268435456;
+    PRAGMA cache_size=-65536;
+    PRAGMA query_only=1;
+'''
+
+# Dashboard snapshots (and the page and API payloads built from them) are
+# reused for this many seconds, so several open tabs polling every 5 seconds
+# cost one build between them
+RESPONSE_TTL = 2.5
+response_cache = {}
+# One build lock per cache key, so builds of unrelated keys run concurrently
+response_cache_locks = {}
+response_cache_lock = threading.Lock()
+
+# Rendered recent trades rows, as (last trade rowid, limit) and the HTML
+trade_rows_cache = (None, Markup(''))
+
+# Parsed bot state file, as ((mtime_ns, size), state)
+state_cache = (None, None)
+
+# Per-market bot state fields the page shows; the rest (order book update
+# times, share counts) change on every 2 second export and are left out of
+# the data ETag, as are the state's timestamp and message counters
+RENDERED_MARKET_KEYS = ('symbol', 'slug', 'yes_price', 'no_price', 'combined_price',
+                        'arbitrage_opportunity', 'total_cost', 'guaranteed_profit', 'has_data')
+
+# Market fields the page's script patches in place from /api/data; a change
+# to any other rendered field re-renders the page
+BOUND_MARKET_KEYS = ('yes_price', 'no_price', 'combined_price', 'total_cost', 'guaranteed_profit')
+
+# Idle connections kept for reuse; each request takes one (opening a new one
+# if none is idle) and hands it back when it ends, closing any beyond the limit
+DB_POOL_SIZE = 4
+db_pool = queue.LifoQueue(maxsize=DB_POOL_SIZE)
+
 # HTML Template
 DASHBOARD_HTML = """
 <!DOCTYPE html>
 <html>
 <head>
     <title>Gabagool Bot Dashboard</title>
-    <meta http-equiv="refresh" content="5">
-    <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body {
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: #333;
-            padding: 20px;
-        }
-        .container {
-            max-width: 1400px;
-            margin: 0 auto;
-        }
-        .header {
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }
-        .header h1 {
-            color: #667eea;
-            margin-bottom: 10px;
-        }
-        .stats-grid {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 15px;
-            margin-bottom: 20px;
-        }
-        .stat-card {
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }
-        .stat-card h3 {
-            color: #666;
-            font-size: 14px;
-            margin-bottom: 10px;
-            text-transform: uppercase;
-        }
-        .stat-card .value {
-            font-size: 32px;
-            font-weight: bold;
-            color: #667eea;
-        }
-        .stat-card .label {
-            font-size: 12px;
-            color: #999;
-            margin-top: 5px;
-        }
-        .positions-section {
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }
-        .positions-section h2 {
-            color: #667eea;
-            margin-bottom: 15px;
-        }
-        .position-card {
-            background: #f8f9fa;
-            padding: 15px;
-            border-radius: 8px;
-            margin-bottom: 10px;
-            border-left: 4px solid #667eea;
-        }
-        .position-header {
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            margin-bottom: 10px;
-        }
-        .position-header h3 {
-            color: #333;
-        }
-        .position-stats {
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
-            gap: 10px;
-            margin-top: 10px;
-        }
-        .position-stat {
-            background: white;
-            padding: 10px;
-            border-radius: 5px;
-        }
-        .position-stat label {
-            font-size: 12px;
-            color: #666;
-            display: block;
-            margin-bottom: 5px;
-        }
-        .position-stat .value {
-            font-size: 18px;
-            font-weight: bold;
-            color: #667eea;
-        }
-        .trades-section {
-            background: white;
-            padding: 20px;
-            border-radius: 10px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }
-        .trades-section h2 {
-            color: #667eea;
-            margin-bottom: 15px;
-        }
-        .trades-table {
-            width: 100%;
-            border-collapse: collapse;
-        }
-        .trades-table th {
-            background: #667eea;
-            color: white;
-            padding: 12px;
-            text-align: left;
-            font-weight: 600;
-        }
-        .trades-table td {
-            padding: 12px;
-            border-bottom: 1px solid #eee;
-        }
-        .trades-table tr:hover {
-            background: #f8f9fa;
-        }
-        .badge {
-            display: inline-block;
-            padding: 4px 8px;
-            border-radius: 4px;
-            font-size: 12px;
-            font-weight: bold;
-        }
-        .badge-success {
-            background: #28a745;
-            color: white;
-        }
-        .badge-warning {
-            background: #ffc107;
-            color: #333;
-        }
-        .badge-danger {
-            background: #dc3545;
-            color: white;
-        }
-        .badge-info {
-            background: #17a2b8;
-            color: white;
-        }
-        .status-indicator {
-            display: inline-block;
-            width: 10px;
-            height: 10px;
-            border-radius: 50%;
-            margin-right: 5px;
-        }
-        .status-online {
-            background: #28a745;
-            animation: pulse 2s infinite;
-        }
-        .status-offline {
-            background: #dc3545;
-        }
-        .price-live {
-            color: #28a745;
-        }
-        .price-stale {
-            color: #dc3545;
-        }
-        @keyframes pulse {
-            0%, 100% { opacity: 1; }
-            50% { opacity: 0.5; }
-        }
-        .last-update {
-            text-align: right;
-            color: #666;
-            font-size: 12px;
-            margin-top: 10px;
-        }
-    </style>
+    <link rel="stylesheet" href="/static/dashboard.css">
 </head>
 <body>
-    <div class="container">
+    <div class="container" data-etag='W/"{{ data_etag }}"' data-layout="{{ layout }}">
         <div class="header">
             <h1>🤖 Gabagool Bot Dashboard</h1>
             <p>
                 <span class="status-indicator {% if live_state.wss_connected %}status-online{% else %}status-offline{% endif %}"></span>
                 <strong>WebSocket:</strong> <span id="wss-status">{% if live_state.wss_connected %}🟢 Connected{% else %}🔴 Disconnected{% endif %}</span> | 
-                <strong>Messages:</strong> {{ live_state.wss_messages }} | 
+                <strong>Messages:</strong> <span data-live="wss_messages">{{ live_state.wss_messages }}</span> | 
                 <strong>Mode:</strong> {% if live_state.simulation_mode %}🔬 Simulation{% else %}🚀 Production{% endif %} |
                 <strong>Last Update:</strong> <span id="last-update">{{ last_update }}</span>
             </p>
@@ -233,6 +108,7 @@ DASHBOARD_HTML = """
             <h2>📊 Live Market Prices</h2>
             {% if live_state.active_markets %}
                 {% for market_id, market in live_state.active_markets.items() %}
+                {% set bind = 'live_state.active_markets.' ~ market_id ~ '.' %}
                 <div class="position-card">
                     <div class="position-header">
                         <h3>{{ market.symbol }} - {{ market.slug.split('-')[-1] if market.slug else 'Current Contract' }}</h3>
@@ -244,34 +120,34 @@ DASHBOARD_HTML = """
                         <div class="position-stat">
                             <label>YES Price</label>
                             <div class="value {% if market.yes_price %}price-live{% else %}price-stale{% endif %}">
-                                {% if market.yes_price %}${{ "%.4f"|format(market.yes_price) }}{% else %}No Data{% endif %}
+                                {% if market.yes_price %}<span data-bind="{{ bind }}yes_price" data-format="$4">${{ "%.4f"|format(market.yes_price) }}</span>{% else %}No Data{% endif %}
                             </div>
                         </div>
                         <div class="position-stat">
                             <label>NO Price</label>
                             <div class="value {% if market.no_price %}price-live{% else %}price-stale{% endif %}">
-                                {% if market.no_price %}${{ "%.4f"|format(market.no_price) }}{% else %}No Data{% endif %}
+                                {% if market.no_price %}<span data-bind="{{ bind }}no_price" data-format="$4">${{ "%.4f"|format(market.no_price) }}</span>{% else %}No Data{% endif %}
                             </div>
                         </div>
                         <div class="position-stat">
                             <label>Combined Price</label>
                             <div class="value {% if market.combined_price %}price-live{% else %}price-stale{% endif %}">
-                                {% if market.combined_price %}{{ "%.4f"|format(market.combined_price) }}{% else %}N/A{% endif %}
+                                {% if market.combined_price %}<span data-bind="{{ bind }}combined_price" data-format="4">{{ "%.4f"|format(market.combined_price) }}</span>{% else %}N/A{% endif %}
                             </div>
                         </div>
                         <div class="position-stat">
                             <label>Arbitrage Margin</label>
                             <div class="value {% if market.arbitrage_opportunity %}price-live{% else %}price-stale{% endif %}">
-                                {% if market.combined_price %}{{ "%.2f"|format((1.0 - market.combined_price) * 100) }}%{% else %}N/A{% endif %}
+                                {% if market.combined_price %}<span data-bind="{{ bind }}combined_price" data-format="margin">{{ "%.2f"|format((1.0 - market.combined_price) * 100) }}%</span>{% else %}N/A{% endif %}
                             </div>
                         </div>
                         <div class="position-stat">
                             <label>Position Cost</label>
-                            <div class="value">${{ "%.2f"|format(market.total_cost) }}</div>
+                            <div class="value" data-bind="{{ bind }}total_cost" data-format="$2">${{ "%.2f"|format(market.total_cost) }}</div>
                         </div>
                         <div class="position-stat">
                             <label>Guaranteed Profit</label>
-                            <div class="value">${{ "%.2f"|format(market.guaranteed_profit) }}</div>
+                            <div class="value" data-bind="{{ bind }}guaranteed_profit" data-format="$2">${{ "%.2f"|format(market.guaranteed_profit) }}</div>
                         </div>
                     </div>
                     <div style="margin-top: 10px; font-size: 11px; color: #666;">
@@ -386,25 +262,13 @@ DASHBOARD_HTML = """
                     </tr>
                 </thead>
                 <tbody>
-                    {% for trade in recent_trades %}
-                    <tr>
-                        <td>{{ trade.timestamp[:19] }}</td>
-                        <td><strong>{{ trade.symbol }}</strong></td>
-                        <td><span class="badge {% if trade.side == 'YES' %}badge-success{% else %}badge-warning{% endif %}">{{ trade.side }}</span></td>
-                        <td>${{ "%.4f"|format(trade.price) }}</td>
-                        <td>{{ "%.2f"|format(trade.shares) }}</td>
-                        <td>${{ "%.2f"|format(trade.cost) }}</td>
-                        <td>{{ "%.4f"|format(trade.combined_price) if trade.combined_price else 'N/A' }}</td>
-                        <td><strong>${{ "%.2f"|format(trade.profit) if trade.profit else '0.00' }}</strong></td>
-                        <td>{{ "%.0f"|format(trade.latency_ms) }}ms</td>
-                    </tr>
-                    {% endfor %}
+                    {{ trade_rows }}
                 </tbody>
             </table>
         </div>
 
         <div class="last-update">
-            Auto-refreshes every 5 seconds | Last updated: {{ last_update }}
+            Auto-refreshes every 5 seconds | Last updated: <span data-live="last_update">{{ last_update }}</span>
         </div>
     </div>
 
@@ -413,16 +277,130 @@ DASHBOARD_HTML = """
         setInterval(() => {
             document.getElementById('last-update').textContent = new Date().toLocaleTimeString();
         }, 1000);
+        
+        // Format a bound value like the template does: an optional '$', the
+        // decimal places and an optional '%'; 'margin' shows a combined price
+        // as its arbitrage margin
+        const formatValue = (value, format) => {
+            if (!format) return String(value);
+            if (format === 'margin') return ((1.0 - value) * 100).toFixed(2) + '%';
+            const [, prefix, places, suffix] = format.match(/^(\$?)(\d+)(%?)$/);
+            return prefix + Number(value).toFixed(places) + suffix;
+        };
+        
+        // Poll the API every 5 seconds; idle polls are 304s. Prices are
+        // patched into their [data-bind] cells from the JSON; anything else
+        // (new trades, markets or positions coming and going) changes the
+        // layout, and the page is re-rendered and swapped in. The message
+        // counter and update time are not in the ETag, so they are fetched
+        // from /api/live on every poll and patched into [data-live] cells.
+        setInterval(async () => {
+            const container = document.querySelector('.container');
+            try {
+                const response = await fetch('/api/data', {
+                    cache: 'no-store',
+                    headers: { 'If-None-Match': container.dataset.etag }
+                });
+                if (response.status === 200) {
+                    const data = await response.json();
+                    
+                    if (data.layout !== container.dataset.layout) {
+                        // The fetched page carries the ETag and layout it was rendered from
+                        const page = await fetch('/', { cache: 'no-store' });
+                        if (!page.ok) return;
+                        const doc = new DOMParser().parseFromString(await page.text(), 'text/html');
+                        container.replaceWith(doc.querySelector('.container'));
+                        return;
+                    }
+                    
+                    container.querySelectorAll('[data-bind]').forEach(el => {
+                        const value = el.dataset.bind.split('.').reduce((obj, key) => obj && obj[key], data);
+                        if (value !== undefined && value !== null) {
+                            el.textContent = formatValue(value, el.dataset.format);
+                        }
+                    });
+                    container.dataset.etag = response.headers.get('ETag');
+                } else if (response.status !== 304) {
+                    return;
+                }
+                
+                const live = await fetch('/api/live', { cache: 'no-store' });
+                if (!live.ok) return;
+                const counters = await live.json();
+                container.querySelectorAll('[data-live]').forEach(el => {
+                    el.textContent = counters[el.dataset.live];
+                });
+            } catch (e) {
+                // Dashboard server unreachable; try again on the next tick
+            }
+        }, 5000);
     </script>
 </body>
 </html>
 """
 
+# Recent trades table rows, rendered separately so they can be cached
+TRADE_ROWS_HTML = """
+                    {% for trade in recent_trades %}
+                    <tr>
+                        <td>{{ trade.timestamp[:19] }}</td>
+                        <td><strong>{{ trade.symbol }}</strong></td>
+                        <td><span class="badge {% if trade.side == 'YES' %}badge-success{% else %}badge-warning{% endif %}">{{ trade.side }}</span></td>
+                        <td>${{ "%.4f"|format(trade.price) }}</td>
+                        <td>{{ "%.2f"|format(trade.shares) }}</td>
+                        <td>${{ "%.2f"|format(trade.cost) }}</td>
+                        <td>{{ "%.4f"|format(trade.combined_price) if trade.combined_price else 'N/A' }}</td>
+                        <td><strong>${{ "%.2f"|format(trade.profit) if trade.profit else '0.00' }}</strong></td>
+                        <td>{{ "%.0f"|format(trade.latency_ms) }}ms</td>
+                    </tr>
+                    {% endfor %}
+"""
+
+# Compiled once; render_template_string would look it up again on every render
+DASHBOARD_TEMPLATE = app.jinja_env.from_string(DASHBOARD_HTML)
+TRADE_ROWS_TEMPLATE = app.jinja_env.from_string(TRADE_ROWS_HTML.strip())
+
+def open_db_connection():
+    """Open a read-only connection to the bot's database"""
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+    conn.executescript(DB_PRAGMAS)
+    return conn
+
 def get_db_connection():
-    """Get database connection"""
+    """Get the current request's database connection, taken from the pool on first use"""
     if not os.path.exists(DB_PATH):
         return None
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
+    if not has_app_context():
+        return open_db_connection()
+    
+    conn = g.get('db_conn')
+    if conn is None:
+        try:
+            conn = db_pool.get_nowait()
+        except queue.Empty:
+            conn = open_db_connection()
+        g.db_conn = conn
+    return conn
+
+@app.teardown_appcontext
+def release_db_connection(exc):
+    """Return the request's connection to the pool, or close it if the pool is full"""
+    conn = g.pop('db_conn', None)
+    if conn is None:
+        return
+    try:
+        db_pool.put_nowait(conn)
+    except queue.Full:
+        conn.close()
+
+@atexit.register
+def close_db_connections():
+    """Close the pooled database connections on exit"""
+    while True:
+        try:
+            db_pool.get_nowait().close()
+        except queue.Empty:
+            break
 
 def calculate_imbalance_ratio(yes_shares, no_shares):
     """Calculate imbalance ratio"""
@@ -434,8 +412,8 @@ def calculate_imbalance_ratio(yes_shares, no_shares):
         return float('inf')
     return max(yes_shares / no_shares, no_shares / yes_shares)
 
-def get_stats():
-    """Get overall statistics"""
+def get_stats(positions=None):
+    """Get overall statistics (positions as returned by get_positions)"""
     conn = get_db_connection()
     if not conn:
         return {
@@ -447,51 +425,33 @@ def get_stats():
             'fill_rate': 0
         }
     
-    cursor = conn.cursor()
-    
-    # Total trades
-    cursor.execute('SELECT COUNT(*) FROM trades')
-    total_trades = cursor.fetchone()[0]
-    
-    # Total spent
-    cursor.execute('SELECT SUM(cost) FROM trades')
-    total_spent = cursor.fetchone()[0] or 0
-    
-    # Latest profit (from most recent trade)
-    cursor.execute('SELECT profit FROM trades ORDER BY timestamp DESC LIMIT 1')
-    latest_profit_row = cursor.fetchone()
-    latest_profit = latest_profit_row[0] if latest_profit_row else 0
+    if positions is None:
+        positions = get_positions()
     
-    # Active positions (unique symbols with recent trades)
-    cursor.execute('''
-        SELECT DISTINCT symbol, 
-               SUM(CASE WHEN side = "YES" THEN shares ELSE 0 END) as yes_shares,
-               SUM(CASE WHEN side = "NO" THEN shares ELSE 0 END) as no_shares,
-               SUM(cost) as total_cost,
-               AVG(combined_price) as avg_combined,
-               MAX(profit) as max_profit
+    # Trade totals and latest profit (from most recent trade)
+    total_trades, total_spent, latest_profit = conn.execute('''
+        SELECT COUNT(*), SUM(cost),
+               (SELECT profit FROM trades ORDER BY rowid DESC LIMIT 1)
         FROM trades
-        WHERE timestamp > datetime('now', '-1 hour')
-        GROUP BY symbol
-        HAVING yes_shares > 0 OR no_shares > 0
-    ''')
-    positions_data = cursor.fetchall()
-    active_positions = len(positions_data)
+    ''').fetchone()
+    total_spent = total_spent or 0
+    if not total_trades:
+        latest_profit = 0
+    
+    # Active positions (symbols with trades in the last hour)
+    active_positions = len(positions)
     
     # Calculate total guaranteed profit from positions
     total_guaranteed = 0
-    for row in positions_data:
-        yes_shares, no_shares = row[1], row[2]
-        avg_combined = row[4] or 0
+    for position in positions.values():
+        avg_combined = position['avg_combined_price']
         if avg_combined > 0 and avg_combined < 1.0:
-            min_shares = min(yes_shares, no_shares)
+            min_shares = min(position['yes_shares'], position['no_shares'])
             total_guaranteed += min_shares * (1.0 - avg_combined)
     
     # Orders sent/filled (approximate from trades)
     fill_rate = 100.0 if total_trades > 0 else 0
     
-    conn.close()
-    
     return {
         'total_trades': total_trades,
         'total_spent': total_spent,
@@ -538,7 +498,6 @@ def get_positions():
             'imbalance_ratio': calculate_imbalance_ratio(yes_shares or 0, no_shares or 0)
         }
     
-    conn.close()
     return positions
 
 def get_recent_trades(limit=50):
@@ -552,7 +511,7 @@ def get_recent_trades(limit=50):
         SELECT timestamp, symbol, side, price, shares, cost, 
                combined_price, profit, latency_ms
         FROM trades
-        ORDER BY timestamp DESC
+        ORDER BY rowid DESC
         LIMIT ?
     ''', (limit,))
     
@@ -570,12 +529,34 @@ def get_recent_trades(limit=50):
             'latency_ms': row[8] or 0
         })
     
-    conn.close()
     return trades
 
+def get_trade_rows_html(recent_trades, last_rowid):
+    """Render the recent trades table rows, re-rendering only after new trades
+
+    Trades are only ever appended, so the highest rowid identifies the rows.
+    """
+    global trade_rows_cache
+    key = (last_rowid, len(recent_trades))
+    if trade_rows_cache[0] != key:
+        html = TRADE_ROWS_TEMPLATE.render(recent_trades=recent_trades)
+        trade_rows_cache = (key, Markup(html))
+    return trade_rows_cache[1]
+
+def get_dashboard_snapshot():
+    """Get (stats, positions, recent_trades), aggregating positions only once"""
+    positions = get_positions()
+    return get_stats(positions), positions, get_recent_trades(50)
+
 def get_live_state():
-    """Get live state from bot (prices, connection status)"""
-    if not os.path.exists(STATE_FILE):
+    """Get live state from bot (prices, connection status)
+
+    The parsed file is reused until its mtime or size changes.
+    """
+    global state_cache
+    try:
+        st = os.stat(STATE_FILE)
+    except OSError:
         return {
             'wss_connected': False,
             'wss_messages': 0,
@@ -586,8 +567,12 @@ def get_live_state():
         }
     
     try:
-        with open(STATE_FILE, 'r') as f:
-            state = json.load(f)
+        key = (st.st_mtime_ns, st.st_size)
+        if state_cache[0] != key:
+            with open(STATE_FILE, 'rb') as f:
+                data = f.read()
+            state_cache = (key, orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data))
+        state = dict(state_cache[1])
         
         # Check if data is stale (older than 10 seconds)
         if state.get('timestamp'):
@@ -610,34 +595,168 @@ def get_live_state():
             'error': str(e)
         }
 
+def cached_response(key, build):
+    """Return build(), reusing the result for RESPONSE_TTL seconds across threads
+
+    Requests that arrive while a build of the same key is running wait for
+    it instead of starting their own.
+    """
+    with response_cache_lock:
+        key_lock = response_cache_locks.get(key)
+        if key_lock is None:
+            key_lock = response_cache_locks[key] = threading.Lock()
+    with key_lock:
+        cached = response_cache.get(key)
+        if cached and time.monotonic() - cached[0] < RESPONSE_TTL:
+            return cached[1]
+        value = build()
+        response_cache[key] = (time.monotonic(), value)
+        return value
+
+def render_dashboard(snapshot):
+    """Render the dashboard page HTML"""
+    return DASHBOARD_TEMPLATE.render(
+        stats=snapshot['stats'],
+        positions=snapshot['positions'],
+        trade_rows=get_trade_rows_html(snapshot['recent_trades'], snapshot['last_rowid']),
+        live_state=snapshot['live_state'],
+        last_update=snapshot['time'].strftime('%Y-%m-%d %H:%M:%S'),
+        data_etag=snapshot['etag'],
+        layout=snapshot['layout']
+    )
+
+def finite_json(value):
+    """Copy value with non-finite floats (imbalance ratios) replaced by None"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {k: finite_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [finite_json(v) for v in value]
+    return value
+
+def dump_json(data):
+    """Serialize data to JSON bytes, with orjson when it is installed
+
+    Infinite values are written as null either way, as orjson does; the
+    page's script could not parse json's Infinity.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(finite_json(data), sort_keys=True, separators=(',', ':')).encode()
+
+def rendered_state(live_state):
+    """The parts of the bot state the page shows, without its counters"""
+    return {
+        'wss_connected': live_state.get('wss_connected'),
+        'simulation_mode': live_state.get('simulation_mode'),
+        'active_markets': {
+            market_id: {key: market.get(key) for key in RENDERED_MARKET_KEYS}
+            for market_id, market in (live_state.get('active_markets') or {}).items()
+        }
+    }
+
+def page_layout(state):
+    """The rendered bot state, less the values the page patches in place
+
+    Prices only count by whether there is one, which picks the markup.
+    """
+    return {
+        **state,
+        'active_markets': {
+            market_id: {key: bool(value) if key in BOUND_MARKET_KEYS else value
+                        for key, value in market.items()}
+            for market_id, market in state['active_markets'].items()
+        }
+    }
+
+def snapshot_hash(*parts):
+    """Short hex digest of the JSON encoding of parts"""
+    return hashlib.blake2b(dump_json(parts), digest_size=8).hexdigest()
+
+def build_snapshot():
+    """Read everything the page and /api/data show, so both are built from
+    the same data
+
+    The trade queries share one read transaction, so the newest rowid
+    matches the rows and aggregates read with it. The ETag covers the
+    newest trade, the aggregates and the bot state fields the page shows;
+    the layout leaves out the values the page patches from /api/data.
+    """
+    conn = get_db_connection()
+    if conn:
+        conn.execute('BEGIN')
+    try:
+        last_rowid = conn.execute('SELECT MAX(rowid) FROM trades').fetchone()[0] if conn else None
+        stats, positions, recent_trades = get_dashboard_snapshot()
+    finally:
+        if conn:
+            conn.execute('COMMIT')
+    live_state = get_live_state()
+    state = rendered_state(live_state)
+    return {
+        'stats': stats,
+        'positions': positions,
+        'recent_trades': recent_trades,
+        'live_state': live_state,
+        'last_rowid': last_rowid,
+        'time': datetime.now(),
+        'etag': snapshot_hash(last_rowid, stats, positions, state),
+        'layout': snapshot_hash(last_rowid, stats, positions, page_layout(state)),
+        'views': {}
+    }
+
+def snapshot_view(name, build):
+    """Return build(snapshot) for the current snapshot, built once per snapshot"""
+    snapshot = cached_response('snapshot', build_snapshot)
+    views = snapshot['views']
+    if name not in views:
+        views[name] = build(snapshot)
+    return views[name]
+
+def build_api_data(snapshot):
+    """Build the /api/data body and its ETag
+
+    The ETag leaves out the timestamps, counters and order book update
+    times, so polls stay 304 Not Modified until something shown changes.
+    """
+    data = {
+        'stats': snapshot['stats'],
+        'positions': snapshot['positions'],
+        'recent_trades': snapshot['recent_trades'],
+        'live_state': snapshot['live_state'],
+        'layout': snapshot['layout'],
+        'timestamp': snapshot['time'].isoformat()
+    }
+    return dump_json(data), snapshot['etag']
+
+def build_api_live(snapshot):
+    """Build the /api/live body: the values the data ETag leaves out that
+    the page still refreshes on every poll"""
+    return dump_json({
+        'wss_messages': snapshot['live_state'].get('wss_messages', 0),
+        'last_update': snapshot['time'].strftime('%Y-%m-%d %H:%M:%S')
+    })
+
 @app.route('/')
 def dashboard():
     """Main dashboard page"""
-    stats = get_stats()
-    positions = get_positions()
-    recent_trades = get_recent_trades(50)
-    live_state = get_live_state()
-    last_update = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    return render_template_string(
-        DASHBOARD_HTML,
-        stats=stats,
-        positions=positions,
-        recent_trades=recent_trades,
-        live_state=live_state,
-        last_update=last_update
-    )
+    return snapshot_view('page', render_dashboard)
 
 @app.route('/api/data')
 def api_data():
     """API endpoint for JSON data"""
-    return jsonify({
-        'stats': get_stats(),
-        'positions': get_positions(),
-        'recent_trades': get_recent_trades(50),
-        'live_state': get_live_state(),
-        'timestamp': datetime.now().isoformat()
-    })
+    body, etag = snapshot_view('api_data', build_api_data)
+    response = Response(body, mimetype='application/json')
+    # Weak, as the body's counters may differ; Flask-Compress also leaves
+    # weak ETags as they are instead of suffixing the encoding
+    response.set_etag(etag, weak=True)
+    return response.make_conditional(request)
+
+@app.route('/api/live')
+def api_live():
+    """API endpoint for the message counter and update time"""
+    return Response(snapshot_view('api_live', build_api_live), mimetype='application/json')
 
 if __name__ == '__main__':
     print("=" * 70)
@@ -648,7 +767,9 @@ if __name__ == '__main__':
     print(f"💾 Database: {DB_PATH}")
     print("=" * 70)
     print("\n💡 Tip: Keep this running while the bot is active")
-    print("   The dashboard auto-refreshes every 5 seconds\n")
+    print("   The dashboard auto-refreshes every 5 seconds")
+    print("   For many open tabs, serve it with gunicorn instead:")
+    print("   gunicorn -w 2 -k gthread --threads 8 -b 0.0.0.0:5000 dashboard:app\n")
     
     app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
 
@@ -324,6 +324,9 @@ class GabagoolUltra:
     
     def _init_db(self):
         self.db = sqlite3.connect('gabagool_ultra.db')
+        # WAL lets the dashboard read while trades are being written; the
+        # mode is stored in the database file
+        self.db.execute('PRAGMA journal_mode=WAL')
         self.db.execute('''
             CREATE TABLE IF NOT EXISTS trades (
                 id INTEGER PRIMARY KEY, timestamp TEXT, symbol TEXT,
@@ -332,6 +335,8 @@ class GabagoolUltra:
                 combined_price REAL, profit REAL, order_id TEXT
             )
         ''')
+        # The dashboard's last-hour positions query ranges over timestamp
+        self.db.execute('CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)')
         self.db.commit()
     
     # ==================== MARKET DISCOVERY ====================
@@ -1161,10 +1166,13 @@ class GabagoolUltra:
                     'has_data': best_yes is not None and best_no is not None
                 }
             
-            # Write to JSON file
+            # Write to a temp file and swap it in, so readers never see a
+            # partially written file
             state_file = 'gabagool_state.json'
-            with open(state_file, 'w') as f:
+            tmp_file = state_file + '.tmp'
+            with open(tmp_file, 'w') as f:
                 json.dump(state, f, indent=2)
+            os.replace(tmp_file, state_file)
                 
         except Exception as e:
             logger.debug(f"State export failed: {e}")
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Load trades.json files as NumPy columns, cached on disk as .npz, and
+column helpers shared by the analysis scripts
+
+The scripts' per-trade scans come in pairs: a plain loop (``_*_loop``),
+compiled with Numba when it is installed, and a NumPy version returning the
+same arrays for installs without it. The loops are compiled eagerly against
+a fixed signature with cache=True, so the machine code is kept in
+__pycache__ and only the first run pays for compilation.
+"""
+
+import json
+import os
+from array import array
+
+import numpy as np
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CACHE_SUFFIX = '.cache.npz'
+
+# Errors raised for a malformed trades file (orjson.JSONDecodeError
+# subclasses json.JSONDecodeError)
+JSON_ERRORS = (json.JSONDecodeError,) if ijson is None else (json.JSONDecodeError, ijson.JSONError)
+
+# Files at least this large are streamed with ijson instead of parsed whole
+STREAM_MIN_BYTES = 64 * 1024 * 1024
+
+# int8 codes for the outcome and side fields (missing or empty is 0)
+OUTCOME_CODES = {'up': 1, 'down': -1}
+SIDE_CODES = {'BUY': 1, 'SELL': -1}
+
+# Code for a value that is present but not recognized; the raw value is kept
+# in the outcome_other/side_other column so reports can still show it
+UNKNOWN_CODE = 2
+
+COLUMNS = (
+    'timestamp',
+    'size',
+    'price',
+    'outcome_up',
+    'outcome_down',
+    'side_buy',
+    'side_sell',
+    'outcome_other',
+    'side_other',
+    'tx_hash',
+    'title',
+)
+
+def iter_trades(trades_file):
+    """Yield the trades in a JSON file, streaming large files with ijson"""
+
+    if ijson is not None and os.path.getsize(trades_file) >= STREAM_MIN_BYTES:
+        with open(trades_file, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
+        return
+
+    if orjson is not None:
+        with open(trades_file, 'rb') as f:
+            trades = orjson.loads(f.read())
+    else:
+        with open(trades_file, 'r', encoding='utf-8') as f:
+            trades = json.load(f)
+    yield from trades or []
+
+def _other_column(n, values):
+    """String column holding values (row -> raw value), '' everywhere else"""
+    column = np.zeros(n, dtype=f"U{max(map(len, values.values()), default=1)}")
+    column[list(values)] = list(values.values())
+    return column
+
+def _parse_trades(trades_file):
+    """Parse a trades JSON file into columns sorted by timestamp
+
+    Each trade is appended straight into typed arrays, so a streamed file
+    never holds more than one trade dict at a time. 'title' is not a
+    column but the first trade's market title, as a 0-d string array.
+    """
+
+    timestamp = array('q')
+    size = array('d')
+    price = array('d')
+    outcome = array('b')
+    side = array('b')
+    tx_hash = []
+    title = None
+
+    # Codes by raw field value, so each spelling is case-folded only once
+    outcome_codes = {}
+    side_codes = {}
+
+    # Raw values of unrecognized outcomes and sides, by row
+    outcome_other = {}
+    side_other = {}
+
+    for t in iter_trades(trades_file):
+        if title is None:
+            title = t.get('title', 'Unknown Market')
+        timestamp.append(int(t.get('timestamp', 0)))
+        size.append(float(t.get('size', 0)))
+        price.append(float(t.get('price', 0)))
+
+        raw = t.get('outcome', '')
+        code = outcome_codes.get(raw)
+        if code is None:
+            code = outcome_codes[raw] = OUTCOME_CODES.get(raw.lower(), UNKNOWN_CODE if raw else 0)
+        if code == UNKNOWN_CODE:
+            outcome_other[len(outcome)] = raw
+        outcome.append(code)
+
+        raw = t.get('side', '')
+        code = side_codes.get(raw)
+        if code is None:
+            code = side_codes[raw] = SIDE_CODES.get(raw.upper(), UNKNOWN_CODE if raw else 0)
+        if code == UNKNOWN_CODE:
+            side_other[len(side)] = raw
+        side.append(code)
+
+        tx_hash.append(t.get('transactionHash', '') or '')
+
+    outcome = np.frombuffer(outcome, dtype=np.int8)
+    side = np.frombuffer(side, dtype=np.int8)
+    columns = {
+        'timestamp': np.frombuffer(timestamp, dtype=np.int64),
+        'size': np.frombuffer(size, dtype=np.float64),
+        'price': np.frombuffer(price, dtype=np.float64),
+        'outcome_up': outcome == 1,
+        'outcome_down': outcome == -1,
+        'side_buy': side == 1,
+        'side_sell': side == -1,
+        'outcome_other': _other_column(len(outcome), outcome_other),
+        'side_other': _other_column(len(side), side_other),
+        'tx_hash': np.array(tx_hash, dtype=str),
+    }
+    title = np.array('Unknown Market' if title is None else title)
+
+    # The bot appends trades in order, so usually there is nothing to sort;
+    # otherwise a stable sort keeps same-timestamp trades in file order
+    ts = columns['timestamp']
+    if not np.all(ts[1:] >= ts[:-1]):
+        order = np.argsort(ts, kind='stable')
+        columns = {key: column[order] for key, column in columns.items()}
+    columns['title'] = title
+    return columns
+
+def load(trades_file):
+    """Load trades as a dict of column arrays, sorted by timestamp
+
+    The parsed columns are saved next to the JSON file as
+    ``<trades_file>.cache.npz`` and reused while the cache is newer than
+    the JSON file.
+    """
+
+    cache_file = trades_file + CACHE_SUFFIX
+
+    try:
+        if os.path.getmtime(cache_file) >= os.path.getmtime(trades_file):
+            with np.load(cache_file) as cached:
+                if all(key in cached.files for key in COLUMNS):
+                    return {key: cached[key] for key in COLUMNS}
+    except (OSError, ValueError):
+        pass
+
+    columns = _parse_trades(trades_file)
+
+    # Write atomically; an unwritable reports directory just means no cache
+    tmp_file = cache_file + '.tmp'
+    try:
+        with open(tmp_file, 'wb') as f:
+            np.savez(f, **columns)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+    return columns
+
+def existing_files(paths):
+    """Return the paths that exist, listing each directory once with os.scandir"""
+
+    listings = {}
+    for directory in {os.path.dirname(p) or '.' for p in paths}:
+        try:
+            with os.scandir(directory) as entries:
+                listings[directory] = {e.name for e in entries if e.is_file()}
+        except OSError:
+            listings[directory] = set()
+
+    return [p for p in paths if os.path.basename(p) in listings[os.path.dirname(p) or '.']]
+
+def forward_fill(values, mask):
+    """Carry values[mask] forward over the unmasked entries (NaN before the first)"""
+
+    idx = np.where(mask, np.arange(values.shape[0]), -1)
+    np.maximum.accumulate(idx, out=idx)
+    return np.where(idx >= 0, values[idx], np.nan)